@@ -0,0 +1,239 @@
+"""
+Generation benchmark for generateSudoku.py.
+
+For every backend and difficulty, builds `--count` puzzles from fixed seeds and
+times each phase separately: filling a complete grid, carving it into a puzzle
+(remove_cells) and a uniqueness count on the result (count_solutions with a
+limit of 2). Prints a JSON report with throughput and latency percentiles to
+STDOUT (or --output) so runs can be diffed across backends and commits, and a
+short summary to STDERR.
+
+Usage:
+  python benchmarkSudoku.py [--count N] [--seed N] [--backend NAME ...]
+                            [--difficulty NAME ...] [--grids backtrack|symmetry]
+                            [--output FILE]
+
+  python benchmarkSudoku.py corpus [--backend NAME ...] [--category NAME ...]
+                                   [--repeat N] [--output FILE]
+
+The `corpus` mode instead times solve_sudoku and count_solutions (limit 2) on
+every puzzle of corpus/solver-reference-v1.json, a fixed set of reference
+puzzles from easy to minimal 17-clue and known pathological inputs. Each
+entry's `solutions` field is its expected count_solutions(limit=2). The
+'backtrack' backend can take minutes on the pathological entries.
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import argparse
+import platform
+
+from generateSudoku import (
+    SEARCHES,
+    carve_board,
+    count_solutions,
+    generate_complete_sudoku,
+    puzzle_rng,
+    solve_sudoku,
+)
+from sudokuBoard import Board
+
+PHASES = ["complete_grid", "remove_cells", "count_solutions"]
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "corpus", "solver-reference-v1.json"
+)
+CORPUS_BACKENDS = ["mrv", "dlx", "bitboard"]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    total = sum(timings)
+    return {
+        "n": len(timings),
+        "total_s": total,
+        "per_second": len(timings) / total if total else None,
+        "mean_s": total / len(timings) if timings else None,
+        "p50_s": percentile(timings, 50),
+        "p95_s": percentile(timings, 95),
+        "p99_s": percentile(timings, 99),
+        "max_s": timings[-1] if timings else None,
+    }
+
+
+def benchmark_difficulty(difficulty, count, seed, backend, grids):
+    timings = {phase: [] for phase in PHASES}
+    for i in range(1, count + 1):
+        # Same streams for every backend, so they all work on identical puzzles
+        rng = puzzle_rng(f"bench-{seed}-{difficulty}", i)
+        start = time.perf_counter()
+        complete = generate_complete_sudoku(rng, grids)
+        filled = time.perf_counter()
+        puzzle = carve_board(Board.from_grid(complete), difficulty, backend, rng)
+        carved = time.perf_counter()
+        count_solutions(puzzle, limit=2, backend=backend)
+        counted = time.perf_counter()
+        timings["complete_grid"].append(filled - start)
+        timings["remove_cells"].append(carved - filled)
+        timings["count_solutions"].append(counted - carved)
+    # Whole puzzles, as generate_sudoku_puzzle would see them
+    timings["puzzle"] = [
+        sum(parts) for parts in zip(timings["complete_grid"], timings["remove_cells"])
+    ]
+    return {phase: summarize(values) for phase, values in timings.items()}
+
+
+def run_benchmark(count, seed, backends, difficulties, grids):
+    report = {
+        "config": {
+            "count": count,
+            "seed": seed,
+            "backends": backends,
+            "difficulties": difficulties,
+            "grids": grids,
+            "python": platform.python_version(),
+        },
+        "results": {},
+    }
+    for backend in backends:
+        report["results"][backend] = {}
+        for difficulty in difficulties:
+            result = benchmark_difficulty(difficulty, count, seed, backend, grids)
+            report["results"][backend][difficulty] = result
+            puzzle = result["puzzle"]
+            print(
+                f"{backend:>9} {difficulty:>6}: {puzzle['per_second']:8.1f} puzzles/s"
+                f"  p50 {puzzle['p50_s'] * 1000:7.2f}ms"
+                f"  p95 {puzzle['p95_s'] * 1000:7.2f}ms"
+                f"  p99 {puzzle['p99_s'] * 1000:7.2f}ms",
+                file=sys.stderr,
+            )
+    return report
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def time_corpus_entry(entry, backend, repeat):
+    """Best-of-`repeat` timings for one corpus puzzle on one backend."""
+    board = Board(int(ch) for ch in entry["puzzle"])
+    solve_times, count_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solve_sudoku(board.copy(), backend)
+        solved = time.perf_counter()
+        count = count_solutions(board, limit=2, backend=backend)
+        counted = time.perf_counter()
+        solve_times.append(solved - start)
+        count_times.append(counted - solved)
+    return {
+        "solve_s": min(solve_times),
+        "count_s": min(count_times),
+        "solutions": count,
+        "ok": count == entry["solutions"],
+    }
+
+
+def run_corpus(corpus, backends, repeat=1):
+    report = {"config": {"backends": backends, "repeat": repeat}, "results": {}}
+    for backend in backends:
+        results = {}
+        for entry in corpus:
+            result = time_corpus_entry(entry, backend, repeat)
+            results[entry["name"]] = result
+            print(
+                f"{backend:>9} {entry['name']:>18} ({entry['category']}):"
+                f" solve {result['solve_s'] * 1000:9.2f}ms"
+                f"  count {result['count_s'] * 1000:9.2f}ms"
+                f"{'' if result['ok'] else '  WRONG SOLUTION COUNT'}",
+                file=sys.stderr,
+            )
+        worst = max(results.values(), key=lambda r: r["solve_s"] + r["count_s"])
+        report["results"][backend] = {
+            "puzzles": results,
+            "worst_s": worst["solve_s"] + worst["count_s"],
+            "all_ok": all(r["ok"] for r in results.values()),
+        }
+    return report
+
+
+def write_report(report, path):
+    text = json.dumps(report, indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def positive_int(text):
+    """argparse type for counts: a summary of zero runs has no rates to print."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def corpus_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="benchmarkSudoku.py corpus",
+        description="Time solvers on reference puzzles",
+    )
+    parser.add_argument("--backend", choices=list(SEARCHES), action="append")
+    parser.add_argument("--category", action="append")
+    parser.add_argument("--repeat", type=positive_int, default=1)
+    parser.add_argument("--output")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus()
+    if args.category:
+        corpus = [entry for entry in corpus if entry["category"] in args.category]
+    report = run_corpus(corpus, args.backend or CORPUS_BACKENDS, args.repeat)
+    write_report(report, args.output)
+    sys.exit(0 if all(r["all_ok"] for r in report["results"].values()) else 1)
+
+
+def main():
+    if sys.argv[1:2] == ["corpus"]:
+        corpus_main(sys.argv[2:])
+        return
+    parser = argparse.ArgumentParser(description="Benchmark puzzle generation")
+    parser.add_argument("--count", type=positive_int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=list(SEARCHES), action="append")
+    parser.add_argument(
+        "--difficulty", choices=["easy", "medium", "hard"], action="append"
+    )
+    parser.add_argument(
+        "--grids", choices=["backtrack", "symmetry"], default="backtrack"
+    )
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.count,
+        args.seed,
+        args.backend or ["mrv"],
+        args.difficulty or ["easy", "medium", "hard"],
+        args.grids,
+    )
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Pure-Python Sudoku solver on 81-bit integer bitboards.
+
+The candidate state is nine Python ints, one per digit, with bit `cell` set
+when that digit can still go in that cell. Placing a digit, finding naked and
+hidden singles and picking the most constrained cell are all whole-board
+bitwise operations, so each one touches all 81 cells in a single CPython
+operation instead of a Python-level loop over cells. Work per unit (hidden
+singles, digits with two places left) runs on all nine digits at once.
+"""
+
+from sudokuTables import PEERS, UNITS
+
+FULL = (1 << 81) - 1
+PEER_MASKS = [sum(1 << peer for peer in PEERS[cell]) for cell in range(81)]
+
+
+def pack(masks):
+    """Pack nine per-digit masks into one int, digit d in bits 81*d .. 81*d + 80."""
+    return sum(mask << 81 * d for d, mask in enumerate(masks))
+
+
+# Hidden singles are found for all nine digits at once on packed masks. Each
+# unit is summarised at its first cell (its origin) by folding the unit onto
+# it in two steps of three, and the result is spread back over the unit by
+# multiplying with the unit's shape.
+ROW_ORIGINS = pack([sum(1 << unit[0] for unit in UNITS[0:9])] * 9)
+COL_ORIGINS = pack([sum(1 << unit[0] for unit in UNITS[9:18])] * 9)
+BOX_ORIGINS = pack([sum(1 << unit[0] for unit in UNITS[18:27])] * 9)
+ROW_SHAPE = sum(1 << cell for cell in UNITS[0])
+COL_SHAPE = sum(1 << cell for cell in UNITS[9])
+BOX_SHAPE = sum(1 << cell for cell in UNITS[18])
+UNIT_FOLDS = [
+    (1, 3, ROW_ORIGINS, ROW_SHAPE),
+    (9, 27, COL_ORIGINS, COL_SHAPE),
+    (1, 9, BOX_ORIGINS, BOX_SHAPE),
+]
+
+
+def place(cands, solved, cell, digit):
+    """Put `digit` (0-based) in `cell`. Returns the bit of the filled cell."""
+    bit = 1 << cell
+    clear = ~bit
+    for d in range(9):
+        cands[d] &= clear
+    cands[digit] &= ~PEER_MASKS[cell]
+    solved[digit] |= bit
+    return bit
+
+
+def count_candidates(cands):
+    """Bit-sliced per-cell candidate counts: count = b0 + 2*b1 + 4*b2 + 8*b3."""
+    b0 = b1 = b2 = b3 = 0
+    for mask in cands:
+        carry0 = b0 & mask
+        b0 ^= mask
+        carry1 = b1 & carry0
+        b1 ^= carry0
+        carry2 = b2 & carry1
+        b2 ^= carry1
+        b3 |= carry2
+    return b0, b1, b2, b3
+
+
+def fold3(counts, step):
+    """Merge the digit counts at offsets 0, `step` and 2 * `step` into offset 0.
+
+    `counts` is three packed masks with a bit where a digit was seen at least
+    once, twice and three times.
+    """
+    once, twice, thrice = counts
+    once1, twice1, thrice1 = once >> step, twice >> step, thrice >> step
+    once2, twice2, thrice2 = once >> 2 * step, twice >> 2 * step, thrice >> 2 * step
+    return (
+        once | once1 | once2,
+        twice | twice1 | twice2 | (once & once1) | (once2 & (once | once1)),
+        thrice
+        | thrice1
+        | thrice2
+        | (twice & (once1 | once2))
+        | (twice1 & (once | once2))
+        | (twice2 & (once | once1))
+        | (once & once1 & once2),
+    )
+
+
+def unit_counts(packed, near, far):
+    """Per-digit candidate counts of every unit, at the unit origins."""
+    return fold3(fold3((packed, 0, 0), near), far)
+
+
+def hidden_singles(cands, solved):
+    """Per-digit masks of hidden singles, or None if some unit lost a digit."""
+    packed = pack(cands)
+    present = packed | pack(solved)
+    singles = 0
+    for near, far, origins, shape in UNIT_FOLDS:
+        seen = present | present >> near | present >> 2 * near
+        seen = seen | seen >> far | seen >> 2 * far
+        if origins & ~seen:
+            return None
+        once, twice, _ = unit_counts(packed, near, far)
+        singles |= (once & ~twice & origins) * shape
+    singles &= packed
+    return [singles >> 81 * d & FULL for d in range(9)]
+
+
+def unit_pair(cands):
+    """`(digit, cells)` for a unit where a digit has exactly two places, or None."""
+    packed = pack(cands)
+    for near, far, origins, shape in UNIT_FOLDS:
+        _, twice, thrice = unit_counts(packed, near, far)
+        pairs = twice & ~thrice & origins
+        if pairs:
+            digit, origin = divmod((pairs & -pairs).bit_length() - 1, 81)
+            return digit, cands[digit] & shape << origin
+    return None
+
+
+def propagate(cands, solved, empty):
+    """Fill naked and hidden singles until stuck.
+
+    Returns the remaining empty-cell mask, or None on a contradiction.
+    """
+    while empty:
+        b0, b1, b2, b3 = count_candidates(cands)
+        high = b1 | b2 | b3
+        if empty & ~(b0 | high):
+            return None
+        singles = empty & b0 & ~high
+        if not singles:
+            # Only look for hidden singles once the naked ones run out
+            hidden = hidden_singles(cands, solved)
+            if hidden is None:
+                return None
+            if not any(hidden):
+                break
+        for d in range(9):
+            pending = cands[d] & (singles or hidden[d])
+            while pending:
+                low = pending & -pending
+                empty &= ~place(cands, solved, low.bit_length() - 1, d)
+                pending &= cands[d]
+    return empty
+
+
+def pick_cell(cands, empty):
+    """The lowest-numbered empty cell with the fewest candidates."""
+    b0, b1, b2, b3 = count_candidates(cands)
+    for count in range(2, 10):
+        mask = empty
+        for bit, plane in ((1, b0), (2, b1), (4, b2), (8, b3)):
+            mask &= plane if count & bit else ~plane
+        if mask:
+            return (mask & -mask).bit_length() - 1
+    return (empty & -empty).bit_length() - 1
+
+
+def search(cands, solved, empty, limit, found, budget=None):
+    if budget is not None:
+        budget.spend()
+    empty = propagate(cands, solved, empty)
+    if empty is None:
+        return 0
+    if not empty:
+        found[:] = solved
+        return 1
+    cell = pick_cell(cands, empty)
+    bit = 1 << cell
+    count = 0
+    # Like dancing links, branch on the two places left for a digit in some
+    # unit when every cell has three or more candidates
+    pair = None
+    if sum(mask >> cell & 1 for mask in cands) > 2:
+        pair = unit_pair(cands)
+    if pair is not None:
+        d, spots = pair
+        while spots:
+            low = spots & -spots
+            spots ^= low
+            branch_cands, branch_solved = cands[:], solved[:]
+            place(branch_cands, branch_solved, low.bit_length() - 1, d)
+            count += search(
+                branch_cands, branch_solved, empty & ~low, limit - count, found, budget
+            )
+            if count >= limit:
+                break
+        return count
+    for d in range(9):
+        if not cands[d] & bit:
+            continue
+        branch_cands, branch_solved = cands[:], solved[:]
+        place(branch_cands, branch_solved, cell, d)
+        count += search(
+            branch_cands, branch_solved, empty & ~bit, limit - count, found, budget
+        )
+        if count >= limit:
+            break
+    return count
+
+
+def bitboard_search(board, limit, budget=None):
+    """A SEARCHES backend (see generateSudoku) on a flat 81-cell `board`."""
+    solved = [0] * 9
+    taken = [0] * 9  # peers of every clue, per digit
+    for cell in range(81):
+        num = board[cell]
+        if num:
+            solved[num - 1] |= 1 << cell
+            taken[num - 1] |= PEER_MASKS[cell]
+    empty = FULL
+    for d in range(9):
+        if solved[d] & taken[d]:
+            return 0
+        empty &= ~solved[d]
+    cands = [empty & ~taken[d] for d in range(9)]
+    found = []
+    count = search(cands, solved, empty, limit, found, budget)
+    if count >= limit:
+        for d, mask in enumerate(found):
+            while mask:
+                low = mask & -mask
+                board[low.bit_length() - 1] = d + 1
+                mask ^= low
+    return count
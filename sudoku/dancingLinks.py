@@ -0,0 +1,193 @@
+"""
+Exact-cover Sudoku solver using Knuth's Algorithm X with dancing links.
+
+A Sudoku is an exact-cover problem over 324 constraints (every cell filled,
+every digit once per row, column and box). Each of the 729 (row, col, digit)
+placements covers exactly four of them. The links are stored in flat lists
+indexed by node number, which is considerably faster in CPython than one
+object per node.
+"""
+
+from sudokuTables import BOX_OF, COL_OF, ROW_OF
+
+N_COLUMNS = 324
+
+
+def placement_columns(cell, num):
+    digit = num - 1
+    return (
+        cell,
+        81 + 9 * ROW_OF[cell] + digit,
+        162 + 9 * COL_OF[cell] + digit,
+        243 + 9 * BOX_OF[cell] + digit,
+    )
+
+
+class DancingLinks:
+    def __init__(self):
+        # Node 0 is the root, nodes 1..324 are the column headers
+        n = N_COLUMNS + 1
+        self.left = [i - 1 for i in range(n)]
+        self.left[0] = n - 1
+        self.right = [i + 1 for i in range(n)]
+        self.right[n - 1] = 0
+        self.up = list(range(n))
+        self.down = list(range(n))
+        self.column = list(range(n))
+        self.size = [0] * n
+        self.label = [None] * n
+        self.row_start = {}
+
+    def add_row(self, label, columns):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        first = None
+        for col in columns:
+            header = col + 1
+            node = len(self.column)
+            self.column.append(header)
+            self.label.append(label)
+            up.append(up[header])
+            down.append(header)
+            down[up[header]] = node
+            up[header] = node
+            self.size[header] += 1
+            if first is None:
+                first = node
+                left.append(node)
+                right.append(node)
+            else:
+                left.append(left[first])
+                right.append(first)
+                right[left[first]] = node
+                left[first] = node
+        self.row_start[label] = first
+
+    def copy(self):
+        links = DancingLinks.__new__(DancingLinks)
+        links.left = self.left[:]
+        links.right = self.right[:]
+        links.up = self.up[:]
+        links.down = self.down[:]
+        links.column = self.column
+        links.size = self.size[:]
+        links.label = self.label
+        links.row_start = self.row_start
+        return links
+
+    def cover(self, c):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, c):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def select(self, label):
+        """Commit to a row up front. Returns False if it clashes with earlier picks."""
+        node = self.row_start[label]
+        j = node
+        while True:
+            c = self.column[j]
+            # A covered header has been unlinked from the header list
+            if self.right[self.left[c]] != c:
+                return False
+            self.cover(c)
+            j = self.right[j]
+            if j == node:
+                return True
+
+    def search(self, limit, solution, budget=None):
+        """Algorithm X. Returns the number of covers found, stopping at `limit`.
+
+        When the limit is reached `solution` holds the labels of the last cover.
+        `budget.spend()` is called once per node if a budget is given.
+        """
+        if budget is not None:
+            budget.spend()
+        left, right, down = self.left, self.right, self.down
+        column, size = self.column, self.size
+        if right[0] == 0:
+            return 1
+        # Branch on the column with the fewest remaining rows
+        c = right[0]
+        best = c
+        while c != 0:
+            if size[c] < size[best]:
+                best = c
+                if size[c] <= 1:
+                    break
+            c = right[c]
+        if size[best] == 0:
+            return 0
+
+        self.cover(best)
+        count = 0
+        r = down[best]
+        while r != best:
+            solution.append(self.label[r])
+            j = right[r]
+            while j != r:
+                self.cover(column[j])
+                j = right[j]
+            count += self.search(limit - count, solution, budget)
+            if count >= limit:
+                return count
+            j = left[r]
+            while j != r:
+                self.uncover(column[j])
+                j = left[j]
+            solution.pop()
+            r = down[r]
+        self.uncover(best)
+        return count
+
+
+_template = None
+
+
+def sudoku_links():
+    """Return a fresh copy of the 729-row Sudoku exact-cover matrix."""
+    global _template
+    if _template is None:
+        _template = DancingLinks()
+        for cell in range(81):
+            for num in range(1, 10):
+                _template.add_row((cell, num), placement_columns(cell, num))
+    return _template.copy()
+
+
+def dlx_search(board, limit, budget=None):
+    """A SEARCHES backend (see generateSudoku) on a flat 81-cell `board`."""
+    links = sudoku_links()
+    for cell in range(81):
+        num = board[cell]
+        if num and not links.select((cell, num)):
+            return 0
+    solution = []
+    count = links.search(limit, solution, budget)
+    if count >= limit:
+        for cell, num in solution:
+            board[cell] = num
+    return count
@@ -1,60 +1,369 @@
 import sys
 import random
 import json
-import copy
+import os
+import re
 import time
+import argparse
+import contextlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bitboardSolver import bitboard_search
+from dancingLinks import dlx_search
+from gradeSudoku import grade_puzzle
+from sudokuBoard import Board, as_board
+from sudokuQuotes import QUOTE_MODES, QuoteProvider
+from sudokuTables import ALL_DIGITS, BOX_OF, COL_OF, PEERS, POPCOUNT, ROW_OF
+from sudokuSymmetry import SymmetryGridFactory, apply_transform, random_transform
 
 HELP_PROMPT = """
 Sudoku Generator Script Usage:
 
-python script.py <count> <difficulty>
+python script.py <count> <difficulty> [--backend NAME] [--workers N]
+                 [--grids backtrack|symmetry] [--bank FILE] [--grade]
+                 [--seed N [--only I ...]] [--format json|ndjson]
+                 [--output FILE [--resume]] [--metrics FILE]
+                 [--quotes FILE ...] [--quote-mode cycle|strict]
+                 [--mix easy=W,medium=W,hard=W]
+                 [--node-budget N] [--time-budget SECONDS]
 
   <count>      : Number of puzzles to generate (e.g., 100)
-  <difficulty> : One of 'easy', 'medium', or 'hard'
+  <difficulty> : One of 'easy', 'medium', 'hard' or 'mixed'
+  --mix        : Share of each difficulty in a 'mixed' run, numbered in the
+                 order given (default easy=0.2,medium=0.3,hard=0.5). Counts
+                 are rounded so they add up to <count> exactly
+  --backend    : Solver used for uniqueness checks: 'mrv' (default),
+                 'backtrack', 'dlx' or 'bitboard'
+  --workers    : Number of processes generating puzzles in parallel (default 1)
+  --grids      : How complete grids are made: 'backtrack' (default) fills each
+                 one from scratch, 'symmetry' relabels and shuffles a few
+                 pre-solved grids, which is much cheaper
+  --bank       : Skip generation and make each puzzle by shuffling/relabelling a
+                 puzzle of the same difficulty from an earlier output FILE.
+                 Uniqueness and clue count carry over
+  --grade      : Pick difficulty by the hardest solving technique a puzzle needs
+                 (singles = easy, pairs/pointing = medium, X-wing or worse =
+                 hard) instead of by clue count
+  --seed       : Make the run reproducible; every puzzle gets its own stream
+                 derived from this seed and its index
+  --only       : Only generate puzzle I of the run (repeatable). Use the same
+                 count, difficulty and seed to get the same puzzle back
+  --format     : 'json' (default) prints one object once everything is done;
+                 'ndjson' prints each puzzle as a `{key: puzzle}` line as soon
+                 as it is generated (with --workers, not in index order)
+  --output     : Write to this file instead of STDOUT
+  --resume     : Keep the puzzles already in --output and only generate the
+                 missing ones. Use ndjson so a killed run leaves usable output
+  --metrics    : Write per-puzzle search counters and phase timings to FILE,
+                 one JSON object per line
+  --node-budget: Abandon a grid and start over on a fresh one once filling
+                 and carving it takes more than N search nodes. Aborts show
+                 up in --metrics
+  --time-budget: Same, with a limit in seconds. Unlike --node-budget this
+                 makes seeded runs depend on machine speed
+  --quotes     : Quote file to take the puzzle quotes from. Repeat to join
+                 several files end to end (default: the bundled quote file)
+  --quote-mode : What to do when there are fewer quotes than puzzles: start
+                 over from the first quote (cycle, default) or refuse to
+                 generate anything (strict)
+
+python script.py verify <file> [--workers N] [--backend NAME]
+
+  Re-checks every puzzle in an output file for a unique solution that matches
+  its stored answer. Uses the 'dlx' backend unless --backend says otherwise.
 
 Example:
   python script.py 5 medium
+  python script.py 5 hard --backend dlx
+  python script.py 100 mixed --seed 42 --only 73
+  python script.py verify generated-mixed.json --workers 8
 
-The script will output a JSON array of sudoku puzzles with the specified count and difficulty.
+The script will output a JSON object of sudoku puzzles with the specified count and difficulty.
 """
 
 
+class GenerationMetrics:
+    """Counters for one puzzle, filled in by the functions it is passed to.
+
+    Search nodes and candidate lookups are counted by the mrv and backtrack
+    searches; the dlx and bitboard backends only show up in uniqueness_checks.
+    Counters include the work on grids abandoned for a budget, whose time is
+    in aborted_s rather than fill_s and removal_s.
+    """
+
+    def __init__(self):
+        self.attempts = 0  # grids carved (more than one with --grade)
+        self.aborts = 0  # grids abandoned for going over the search budget
+        self.fill_nodes = 0  # fill_remaining calls while building full grids
+        self.nodes = 0  # solver search nodes during cell removal
+        self.candidate_checks = 0  # candidate-mask lookups (is_valid equivalents)
+        self.uniqueness_checks = 0
+        self.rejected_removals = 0  # removals undone because uniqueness broke
+        self.fill_s = 0.0
+        self.removal_s = 0.0
+        self.aborted_s = 0.0  # fill and removal time of abandoned grids
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class SearchBudget:
+    """Node and/or time limit on the work spent on one grid.
+
+    Searches call spend() once per node and get BudgetExceeded once either
+    limit is passed. Node limits are deterministic, so seeded runs stay
+    reproducible; time limits are not.
+    """
+
+    def __init__(self, nodes=None, seconds=None):
+        self.nodes = nodes
+        self.seconds = seconds
+        self.restart()
+
+    def restart(self):
+        self.spent = 0
+        self.deadline = None
+        if self.seconds is not None:
+            self.deadline = time.perf_counter() + self.seconds
+
+    def spend(self):
+        self.spent += 1
+        if self.nodes is not None and self.spent > self.nodes:
+            raise BudgetExceeded(f"more than {self.nodes} search nodes")
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExceeded(f"more than {self.seconds}s")
+
+
 def is_valid(board, row, col, num):
-    for x in range(9):
-        if board[row][x] == num or board[x][col] == num:
+    if board[row][col] == num:
+        return False
+    for peer in PEERS[9 * row + col]:
+        if board[ROW_OF[peer]][COL_OF[peer]] == num:
             return False
-    start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-    for i in range(3):
-        for j in range(3):
-            if board[start_row + i][start_col + j] == num:
-                return False
     return True
 
 
-def solve_sudoku(board):
-    for row in range(9):
-        for col in range(9):
-            if board[row][col] == 0:
-                for num in range(1, 10):
-                    if is_valid(board, row, col, num):
-                        board[row][col] = num
-                        if solve_sudoku(board):
-                            return True
-                        board[row][col] = 0
-                return False
+class BoardState:
+    """Tracks which digits are used in every row, column and box of a Board.
+
+    The masks are updated on place/unplace so checking a digit or listing the
+    candidates of a cell is a couple of bitwise operations instead of a scan.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        # False when two clues clash, so the board has no solution at all
+        self.consistent = True
+        for cell in range(81):
+            num = board[cell]
+            if num:
+                bit = 1 << num
+                row, col, box = ROW_OF[cell], COL_OF[cell], BOX_OF[cell]
+                if (self.rows[row] | self.cols[col] | self.boxes[box]) & bit:
+                    self.consistent = False
+                self.rows[row] |= bit
+                self.cols[col] |= bit
+                self.boxes[box] |= bit
+
+    def place(self, cell, num):
+        bit = 1 << num
+        self.board[cell] = num
+        self.rows[ROW_OF[cell]] |= bit
+        self.cols[COL_OF[cell]] |= bit
+        self.boxes[BOX_OF[cell]] |= bit
+
+    def unplace(self, cell, num):
+        bit = ~(1 << num)
+        self.board[cell] = 0
+        self.rows[ROW_OF[cell]] &= bit
+        self.cols[COL_OF[cell]] &= bit
+        self.boxes[BOX_OF[cell]] &= bit
+
+    def is_free(self, cell, num):
+        return bool(self.candidates(cell) & (1 << num))
+
+    def candidates(self, cell):
+        used = (
+            self.rows[ROW_OF[cell]] | self.cols[COL_OF[cell]] | self.boxes[BOX_OF[cell]]
+        )
+        return ~used & ALL_DIGITS
+
+    def empty_cells(self):
+        return self.board.empty_cells()
+
+
+def iter_digits(mask):
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        yield bit.bit_length() - 1
+
+
+def backtrack_search(state, limit, metrics=None, budget=None):
+    """Fill empty cells in row-major order, trying digits in ascending order."""
+    if not state.consistent:
+        return 0
+    empties = state.empty_cells()
+    count = 0
+
+    def search(k):
+        nonlocal count
+        if k == len(empties):
+            count += 1
+            return count >= limit
+        if metrics is not None:
+            metrics.nodes += 1
+            metrics.candidate_checks += 1
+        if budget is not None:
+            budget.spend()
+        cell = empties[k]
+        for num in iter_digits(state.candidates(cell)):
+            state.place(cell, num)
+            if search(k + 1):
+                return True
+            state.unplace(cell, num)
+        return False
+
+    search(0)
+    return count
+
+
+def mrv_search(state, limit, keep_solution=True, metrics=None, budget=None):
+    """Like backtrack_search, but branches on the cell with the fewest candidates.
+
+    Cells left with a single candidate are filled in before branching, and a
+    cell with no candidates prunes the branch immediately. With
+    `keep_solution=False` the board is always restored, so the same state can
+    be queried again.
+    """
+    if not state.consistent:
+        return 0
+    empties = set(state.empty_cells())
+
+    def search(limit):
+        if metrics is not None:
+            metrics.nodes += 1
+        if budget is not None:
+            budget.spend()
+        placed = []
+        while True:
+            if not empties:
+                if limit <= 1 and keep_solution:
+                    return 1
+                for cell, num in placed:
+                    state.unplace(cell, num)
+                    empties.add(cell)
+                return 1
+            if metrics is not None:
+                metrics.candidate_checks += len(empties)
+            best, best_cands, best_count = None, 0, 10
+            for cell in empties:
+                cands = state.candidates(cell)
+                n = POPCOUNT[cands]
+                if n < best_count:
+                    best, best_cands, best_count = cell, cands, n
+                    if n <= 1:
+                        break
+            if best_count != 1:
+                break
+            # Naked single: no need to branch
+            num = best_cands.bit_length() - 1
+            state.place(best, num)
+            empties.remove(best)
+            placed.append((best, num))
+
+        count = 0
+        if best_count:
+            empties.remove(best)
+            for num in iter_digits(best_cands):
+                state.place(best, num)
+                count += search(limit - count)
+                if count >= limit and keep_solution:
+                    return count
+                state.unplace(best, num)
+                if count >= limit:
+                    break
+            empties.add(best)
+        for cell, num in reversed(placed):
+            state.unplace(cell, num)
+            empties.add(cell)
+        return count
+
+    return search(limit)
+
+
+def exact_cover_search(state, limit, metrics=None, budget=None):
+    return dlx_search(state.board, limit, budget)
+
+
+def bitboard_solver_search(state, limit, metrics=None, budget=None):
+    return bitboard_search(state.board, limit, budget)
+
+
+# Every backend returns the number of solutions of `state.board`, stopping at
+# `limit`. When the limit is reached the board is left holding the last
+# solution found; otherwise it is restored to its starting contents.
+SEARCHES = {
+    "backtrack": backtrack_search,
+    "mrv": mrv_search,
+    "dlx": exact_cover_search,
+    "bitboard": bitboard_solver_search,
+}
+
+
+def solve_sudoku(board, backend="mrv"):
+    """Solve `board` in place. Returns False, leaving it untouched, if it has no solution."""
+    solved = as_board(board)
+    if SEARCHES[backend](BoardState(solved), 1) != 1:
+        return False
+    if isinstance(board, Board):
+        board[:] = solved
+    else:
+        board[:] = solved.to_grid()
     return True
 
 
-def fill_diagonal_boxes(board):
+def fill_diagonal_boxes(board, rng=random):
+    """Fill the three diagonal boxes of `board`, a Board or a nested list."""
+    if not isinstance(board, Board):
+        cells = as_board(board)
+        fill_diagonal_boxes(cells, rng)
+        board[:] = cells.to_grid()
+        return
     for k in range(0, 9, 3):
         nums = list(range(1, 10))
-        random.shuffle(nums)
+        rng.shuffle(nums)
         for i in range(3):
             for j in range(3):
-                board[k + i][k + j] = nums.pop()
+                board[9 * (k + i) + k + j] = nums.pop()
 
 
-def fill_remaining(board, i, j):
+def fill_remaining(board, i, j, state=None, metrics=None, budget=None):
+    """Backtrack the cells from row `i`, column `j` on, skipping the diagonal boxes.
+
+    `board` is a Board or a nested list; a nested list is only updated if the
+    fill succeeds.
+    """
+    if not isinstance(board, Board):
+        cells = as_board(board)
+        if not fill_remaining(cells, i, j, None, metrics, budget):
+            return False
+        board[:] = cells.to_grid()
+        return True
+    if state is None:
+        state = BoardState(board)
+    if metrics is not None:
+        metrics.fill_nodes += 1
+    if budget is not None:
+        budget.spend()
     if j >= 9 and i < 8:
         i += 1
         j = 0
@@ -72,139 +381,717 @@ def fill_remaining(board, i, j):
             j = 0
             if i >= 9:
                 return True
-    for num in range(1, 10):
-        if is_valid(board, i, j, num):
-            board[i][j] = num
-            if fill_remaining(board, i, j + 1):
-                return True
-            board[i][j] = 0
+    cell = 9 * i + j
+    for num in iter_digits(state.candidates(cell)):
+        state.place(cell, num)
+        if fill_remaining(board, i, j + 1, state, metrics, budget):
+            return True
+        state.unplace(cell, num)
     return False
 
 
-def generate_complete_sudoku():
-    board = [[0] * 9 for _ in range(9)]
-    fill_diagonal_boxes(board)
-    fill_remaining(board, 0, 3)
-    return board
+SEED_GRID_COUNT = 4
+_symmetry_factory = None
 
 
-def count_solutions(board):
-    count = 0
+def symmetry_grid_factory():
+    """Grid factory over a few backtracked seed grids, built once per process.
 
-    def solve_count(b):
-        nonlocal count
-        for row in range(9):
-            for col in range(9):
-                if b[row][col] == 0:
-                    for num in range(1, 10):
-                        if is_valid(b, row, col, num):
-                            b[row][col] = num
-                            solve_count(b)
-                            b[row][col] = 0
-                    return
-        count += 1
-
-    solve_count(copy.deepcopy(board))
-    return count
+    The seed grids come from fixed seeds so seeded runs are reproducible no
+    matter which worker builds the factory.
+    """
+    global _symmetry_factory
+    if _symmetry_factory is None:
+        seed_grids = [
+            generate_complete_sudoku(random.Random(f"sdku-seed-grid-{k}"))
+            for k in range(SEED_GRID_COUNT)
+        ]
+        _symmetry_factory = SymmetryGridFactory(seed_grids)
+    return _symmetry_factory
 
 
-def remove_cells(board, difficulty):
-    if difficulty == "easy":
-        clues = random.randint(45, 50)
-    elif difficulty == "medium":
-        clues = random.randint(35, 40)
-    else:
-        clues = random.randint(25, 30)
+def generate_complete_sudoku(rng=random, method="backtrack", metrics=None, budget=None):
+    if method == "symmetry":
+        return symmetry_grid_factory().grid(rng)
+    board = Board.empty()
+    fill_diagonal_boxes(board, rng)
+    fill_remaining(board, 0, 3, metrics=metrics, budget=budget)
+    return board.to_grid()
+
+
+def count_solutions(board, limit=None, backend="mrv", metrics=None, budget=None):
+    """Count the solutions of `board`, stopping once `limit` have been found."""
+    if limit is None:
+        limit = float("inf")
+    state = BoardState(as_board(board))
+    return SEARCHES[backend](state, limit, metrics=metrics, budget=budget)
+
+
+def has_unique_solution(board, backend="mrv", metrics=None, budget=None):
+    solutions = count_solutions(board, 2, backend, metrics, budget)
+    return solutions == 1
+
+
+def has_other_solution(state, cell, num, metrics=None, budget=None):
+    """Whether the board can be solved with something other than `num` at `cell`.
+
+    The cell must be empty. This is the only question that matters when
+    removing a clue from a puzzle whose solution (with `num` there) is known to
+    be unique.
+    """
+    for alt in iter_digits(state.candidates(cell) & ~(1 << num)):
+        state.place(cell, alt)
+        found = mrv_search(state, 1, False, metrics, budget)
+        state.unplace(cell, alt)
+        if found:
+            return True
+    return False
+
+
+# Number of clues left in a puzzle of each difficulty (inclusive)
+CLUE_RANGES = {"easy": (45, 50), "medium": (35, 40), "hard": (25, 30)}
+# Share of each difficulty in "mixed" runs
+DEFAULT_MIX = {"easy": 0.2, "medium": 0.3, "hard": 0.5}
+
+
+def carve_board(
+    board, difficulty, backend="mrv", rng=random, metrics=None, budget=None
+):
+    """Blank cells of a Board with a unique solution in place, keeping it unique."""
+    clues = rng.randint(*CLUE_RANGES.get(difficulty, CLUE_RANGES["hard"]))
     cells_to_remove = 81 - clues
 
     # Create and shuffle all cell positions
-    cells = [(r, c) for r in range(9) for c in range(9)]
-    random.shuffle(cells)
+    cells = list(range(81))
+    rng.shuffle(cells)
+
+    if backend == "mrv":
+        # Keep one BoardState for the whole carve and only ask whether the
+        # removed cell could hold a different digit
+        state = BoardState(board)
+        for cell in cells:
+            if cells_to_remove <= 0:
+                break
+            num = board[cell]
+            if num == 0:
+                continue
+            state.unplace(cell, num)
+            if metrics is not None:
+                metrics.uniqueness_checks += 1
+            if has_other_solution(state, cell, num, metrics, budget):
+                state.place(cell, num)
+                if metrics is not None:
+                    metrics.rejected_removals += 1
+            else:
+                cells_to_remove -= 1
+        return board
 
-    for row, col in cells:
+    for cell in cells:
         if cells_to_remove <= 0:
             break
-        if board[row][col] != 0:
-            backup = board[row][col]
-            board[row][col] = 0
-            if count_solutions(board) != 1:
-                board[row][col] = backup
+        if board[cell] != 0:
+            backup = board[cell]
+            board[cell] = 0
+            if metrics is not None:
+                metrics.uniqueness_checks += 1
+            if not has_unique_solution(board, backend, metrics, budget):
+                board[cell] = backup
+                if metrics is not None:
+                    metrics.rejected_removals += 1
             else:
                 cells_to_remove -= 1
     return board
 
 
+def remove_cells(board, difficulty, backend="mrv", rng=random):
+    """Blank cells of a nested-list `board` with a unique solution, keeping it unique."""
+    puzzle = carve_board(Board.from_grid(board), difficulty, backend, rng)
+    board[:] = puzzle.to_grid()
+    return board
+
+
+_puzzle_banks = {}
+
+
+def load_puzzle_bank(path):
+    """Group the puzzles of an earlier output file by difficulty.
+
+    Banks are cached per process so workers only parse the file once.
+    """
+    if path not in _puzzle_banks:
+        bank = {}
+        for puzzle in read_puzzles(path).values():
+            bank.setdefault(puzzle["d"], []).append((puzzle["q"], puzzle["a"]))
+        _puzzle_banks[path] = bank
+    return _puzzle_banks[path]
+
+
+def puzzle_from_bank(bank, difficulty, rng=random):
+    """Make a new puzzle by applying one random symmetry to a banked puzzle.
+
+    The transform keeps the clue count and the unique solution, so no solver
+    work is needed.
+    """
+    question, answer = rng.choice(bank[difficulty])
+    transform = random_transform(rng)
+    return apply_transform(question, transform), apply_transform(answer, transform)
+
+
 def board_to_question(board):
     return [[cell if cell != 0 else 0 for cell in row] for row in board]
 
 
-def generate_sudoku_puzzle(difficulty):
-    complete = generate_complete_sudoku()
-    puzzle = copy.deepcopy(complete)
-    puzzle = remove_cells(puzzle, difficulty)
-    question = board_to_question(puzzle)
-    return question, complete
+GRADE_ATTEMPTS = 50
+GRADE_LEVELS = {"easy": 1, "medium": 2, "hard": 3}
+
+
+def generate_graded_puzzle(difficulty, rng=random, **options):
+    """Generate puzzles until gradeSudoku puts one in the `difficulty` bucket.
+
+    Clue count says little about how hard a puzzle is, so medium and hard
+    candidates are carved down to the hard clue range and kept only if they
+    need the matching techniques. After GRADE_ATTEMPTS the closest candidate
+    is used.
+    """
+    removal = "easy" if difficulty == "easy" else "hard"
+    target = GRADE_LEVELS[difficulty]
+    best, best_distance = None, None
+    for _ in range(GRADE_ATTEMPTS):
+        question, answer = generate_sudoku_puzzle(removal, rng=rng, **options)
+        graded = grade_puzzle(question).technique.difficulty
+        distance = abs(GRADE_LEVELS[graded] - target)
+        if best is None or distance < best_distance:
+            best, best_distance = (question, answer), distance
+        if distance == 0:
+            break
+    return best
+
+
+# Grids abandoned for going over a budget before one is carved without it
+BUDGET_RETRIES = 10
+
+
+def generate_sudoku_puzzle(
+    difficulty,
+    backend="mrv",
+    rng=random,
+    grids="backtrack",
+    bank=None,
+    grade=False,
+    metrics=None,
+    node_budget=None,
+    time_budget=None,
+):
+    """Return `(question, answer)` for one puzzle of `difficulty`.
+
+    With a `node_budget` (search nodes) or `time_budget` (seconds), a grid that
+    takes more than that to fill and carve is abandoned and a fresh one is
+    generated, up to BUDGET_RETRIES times.
+    """
+    if bank is not None:
+        return puzzle_from_bank(load_puzzle_bank(bank), difficulty, rng)
+    if grade:
+        return generate_graded_puzzle(
+            difficulty,
+            rng,
+            backend=backend,
+            grids=grids,
+            metrics=metrics,
+            node_budget=node_budget,
+            time_budget=time_budget,
+        )
+    budget = None
+    if node_budget is not None or time_budget is not None:
+        budget = SearchBudget(node_budget, time_budget)
+    for attempt in range(BUDGET_RETRIES + 1):
+        if attempt == BUDGET_RETRIES:
+            budget = None
+        if budget is not None:
+            budget.restart()
+        start = time.perf_counter()
+        try:
+            complete = generate_complete_sudoku(rng, grids, metrics, budget)
+            filled = time.perf_counter()
+            puzzle = carve_board(
+                Board.from_grid(complete), difficulty, backend, rng, metrics, budget
+            )
+        except BudgetExceeded:
+            if metrics is not None:
+                metrics.aborts += 1
+                metrics.aborted_s += time.perf_counter() - start
+            continue
+        if metrics is not None:
+            metrics.attempts += 1
+            metrics.fill_s += filled - start
+            metrics.removal_s += time.perf_counter() - filled
+        return puzzle.to_grid(), complete
+
+
+def puzzle_rng(seed, i):
+    """Random stream for puzzle `i` of a run seeded with `seed`.
+
+    Each puzzle gets its own stream, so any puzzle can be regenerated on its
+    own and workers never share state. With no seed the stream is seeded from
+    the OS.
+    """
+    if seed is None:
+        return random.Random()
+    # Seed from a string rather than seed + i so that neighbouring seeds
+    # don't produce overlapping books
+    return random.Random(f"sdku-{seed}-{i}")
+
+
+PUZZLE_KEY = re.compile(r"sdku-v1-q\d+")
+
+
+def puzzle_key(i):
+    return f"sdku-v1-q{i}"
+
+
+def puzzle_index(key):
+    return int(key.rsplit("q", 1)[1])
+
+
+def is_puzzle_dict(data):
+    return isinstance(data, dict) and all(PUZZLE_KEY.fullmatch(key) for key in data)
+
+
+def read_puzzles(path):
+    """Load puzzles written by this script in either output format.
+
+    NDJSON lines that are not a puzzle object, such as the half-written last
+    line of a killed run, are skipped. NDJSON puzzles are returned in index
+    order, whatever order they finished in. Raises ValueError if a non-empty
+    file holds no puzzles.
+    """
+    with open(path) as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if not is_puzzle_dict(data):
+            raise ValueError(f"{path}: not a puzzle file")
+        return data
+    puzzles = {}
+    for line in text.splitlines():
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if is_puzzle_dict(data):
+            puzzles.update(data)
+    if not puzzles and text.strip():
+        raise ValueError(f"{path}: no puzzles found")
+    return dict(sorted(puzzles.items(), key=lambda kv: puzzle_index(kv[0])))
+
+
+def generate_puzzle_job(job):
+    i, difficulty, seed, options, collect_metrics = job
+    metrics = GenerationMetrics() if collect_metrics else None
+    start = time.time()
+    question, answer = generate_sudoku_puzzle(
+        difficulty, rng=puzzle_rng(seed, i), metrics=metrics, **options
+    )
+    end = time.time()
+    metrics = metrics.as_dict() if metrics is not None else None
+    return i, difficulty, question, answer, end - start, metrics
+
+
+def job_cost(job):
+    """Expected seconds for a generate_puzzle_job job, from PUZZLES_PER_SECOND."""
+    _, difficulty, _, options, _ = job
+    return 1 / PUZZLES_PER_SECOND[options["backend"]][difficulty]
+
+
+def run_puzzle_jobs(jobs, workers=1):
+    """Yield generate_puzzle_job results.
+
+    With one worker the results come in the order of `jobs`. With several, the
+    jobs are queued longest first and every worker takes the next one as soon
+    as it is free, so the expensive hard puzzles do not end up as the tail of
+    the run; results are yielded as they finish. If a job raises, the jobs
+    still queued are cancelled.
+    """
+    if workers <= 1:
+        yield from map(generate_puzzle_job, jobs)
+        return
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            executor.submit(generate_puzzle_job, job)
+            for job in sorted(jobs, key=job_cost, reverse=True)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # After a failed job, Ctrl-C or the caller stopping early, drop the
+        # queued jobs instead of waiting for all of them to run
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Rough single-worker puzzles per second for each backend, from one run of
+#   python benchmarkSudoku.py --count 30 --backend mrv --backend dlx \
+#       --backend bitboard --backend backtrack
+# on one machine. Other machines and seeds easily differ by 2x, and the hard
+# rates depend on a few slow puzzles, so these only order the parallel jobs
+# and give the ballpark runtime guess printed before a run.
+PUZZLES_PER_SECOND = {
+    "backtrack": {"easy": 140, "medium": 85, "hard": 4},
+    "mrv": {"easy": 250, "medium": 350, "hard": 85},
+    "dlx": {"easy": 30, "medium": 25, "hard": 15},
+    "bitboard": {"easy": 100, "medium": 100, "hard": 55},
+}
+
+PlannedPuzzle = namedtuple("PlannedPuzzle", ["index", "difficulty", "quote"])
+GenerationPlan = namedtuple("GenerationPlan", ["puzzles", "output"])
 
 
-def generate_sudoku_set(count, difficulty):
-    result = {}
-    currentDifficulty = difficulty
-    with open("../quotes/sudoku-motivational-quotes-v1.json") as f:
-        motivational_quotes = json.load(f)
-    for i in range(1, count + 1):
+def check_output_path(path):
+    """Raise ValueError unless `path` can be written as an output file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    if os.path.isdir(path):
+        raise ValueError(f"{path} is a directory")
+    if not os.path.isdir(directory):
+        raise ValueError(f"{directory} does not exist")
+    if not os.access(path if os.path.exists(path) else directory, os.W_OK):
+        raise ValueError(f"{path} is not writable")
+
+
+def plan_sudoku_set(
+    count,
+    difficulty,
+    indices=None,
+    bank=None,
+    quotes=None,
+    output=None,
+    mix=DEFAULT_MIX,
+):
+    """Work out every puzzle of a run and check it can finish, before any solving.
+
+    Returns a GenerationPlan with one PlannedPuzzle per index. Raises ValueError
+    for anything that would otherwise fail part way through: indices outside
+    1..count, a difficulty missing from the bank, too few quotes or an
+    unwritable output path.
+    """
+    if difficulty != "mixed" and difficulty not in CLUE_RANGES:
+        raise ValueError(f"unknown difficulty {difficulty!r}")
+    if quotes is None:
+        quotes = QuoteProvider()
+    if indices is None:
+        indices = range(1, count + 1)
+    outside = [i for i in indices if not 1 <= i <= count]
+    if outside:
+        raise ValueError(f"puzzle numbers {outside} are outside 1..{count}")
+    quotes.check_coverage(indices)
+    puzzles = []
+    for i in indices:
+        currentDifficulty = difficulty
         if difficulty == "mixed":
-            currentDifficulty = get_difficulty(i, count)
-        start = time.time()
-        question, answer = generate_sudoku_puzzle(currentDifficulty)
-        end = time.time()
+            currentDifficulty = get_difficulty(i, count, mix)
+        puzzles.append(PlannedPuzzle(i, currentDifficulty, quotes.quote(i)))
+    if bank is not None:
+        banked = load_puzzle_bank(bank)
+        for puzzle in puzzles:
+            if puzzle.difficulty not in banked:
+                raise ValueError(f"{bank} has no {puzzle.difficulty} puzzles")
+    if output is not None:
+        check_output_path(output)
+    return GenerationPlan(puzzles, output)
+
+
+def estimate_runtime(plan, backend="mrv", workers=1):
+    """Rough wall time in seconds for `plan`, from PUZZLES_PER_SECOND."""
+    rates = PUZZLES_PER_SECOND[backend]
+    total = sum(1 / rates[puzzle.difficulty] for puzzle in plan.puzzles)
+    return total / min(max(workers, 1), max(len(plan.puzzles), 1))
+
+
+def iter_sudoku_set(
+    count,
+    difficulty,
+    backend="mrv",
+    workers=1,
+    seed=None,
+    indices=None,
+    grids="backtrack",
+    bank=None,
+    grade=False,
+    metrics=None,
+    quotes=None,
+    plan=None,
+    mix=DEFAULT_MIX,
+    node_budget=None,
+    time_budget=None,
+):
+    """Yield `(key, puzzle)` pairs for `sdku-v1-q1` .. `sdku-v1-q{count}`.
+
+    Puzzles are yielded as soon as they are ready, not necessarily in index
+    order. `metrics` is a file for one NDJSON line of counters per puzzle.
+    """
+    if plan is None:
+        plan = plan_sudoku_set(
+            count, difficulty, indices=indices, bank=bank, quotes=quotes, mix=mix
+        )
+    quote_of = {puzzle.index: puzzle.quote for puzzle in plan.puzzles}
+    # Passed straight through to generate_sudoku_puzzle
+    options = {
+        "backend": backend,
+        "grids": grids,
+        "bank": bank,
+        "grade": grade,
+        "node_budget": node_budget,
+        "time_budget": time_budget,
+    }
+    jobs = [
+        (puzzle.index, puzzle.difficulty, seed, options, metrics is not None)
+        for puzzle in plan.puzzles
+    ]
+    for i, currentDifficulty, question, answer, elapsed, counters in run_puzzle_jobs(
+        jobs, workers
+    ):
         print(
-            f"Generated {i}/{count} ({currentDifficulty}) in {end - start:.4f}s",
+            f"Generated {i}/{count} ({currentDifficulty}) in {elapsed:.4f}s",
             # We are printing to STDERR because the main JSON gets printed to STDOUT.
             # We do not want to clutter the output.
             file=sys.stderr,
         )
-        key = f"sdku-v1-q{i}"
-        result[key] = {
+        key = puzzle_key(i)
+        if metrics is not None:
+            line = {
+                "key": key,
+                "d": currentDifficulty,
+                "elapsed_s": elapsed,
+                **counters,
+            }
+            metrics.write(json.dumps(line) + "\n")
+            metrics.flush()
+        quote = quote_of[i]
+        yield key, {
             "q": question,
             "a": answer,
             "d": currentDifficulty,
-            "mq": motivational_quotes[i]["q"],
-            "ma": motivational_quotes[i]["a"],
+            "mq": quote["q"],
+            "ma": quote["a"],
         }
-    return result
 
 
-def get_difficulty(i, count):
-    # 20% easy
-    # 30% medium
-    # 50% hard
-    easy_limit = int(0.2 * count)
-    medium_limit = easy_limit + int(0.3 * count)
+def generate_sudoku_set(
+    count,
+    difficulty,
+    backend="mrv",
+    workers=1,
+    seed=None,
+    indices=None,
+    grids="backtrack",
+    bank=None,
+    grade=False,
+    metrics=None,
+    quotes=None,
+    mix=DEFAULT_MIX,
+    node_budget=None,
+    time_budget=None,
+):
+    puzzles = iter_sudoku_set(
+        count,
+        difficulty,
+        backend=backend,
+        workers=workers,
+        seed=seed,
+        indices=indices,
+        grids=grids,
+        bank=bank,
+        grade=grade,
+        metrics=metrics,
+        quotes=quotes,
+        mix=mix,
+        node_budget=node_budget,
+        time_budget=time_budget,
+    )
+    return dict(sorted(puzzles, key=lambda kv: puzzle_index(kv[0])))
 
-    if i <= easy_limit:
-        return "easy"
-    elif i <= medium_limit:
-        return "medium"
-    else:
-        return "hard"
 
+def difficulty_quotas(count, mix=DEFAULT_MIX):
+    """Split `count` puzzles between the tiers of `mix` by largest remainder.
 
-def main():
-    if len(sys.argv) != 3:
+    Every tier gets the whole part of its share, and the puzzles left over go
+    to the tiers with the largest fractional parts (earlier tiers win ties),
+    so the quotas always add up to `count` and are never off by more than one.
+    """
+    total = sum(mix.values())
+    shares = {d: count * weight / total for d, weight in mix.items()}
+    quotas = {d: int(share) for d, share in shares.items()}
+    leftover = count - sum(quotas.values())
+    order = sorted(mix, key=lambda d: shares[d] - quotas[d], reverse=True)
+    for d in order[:leftover]:
+        quotas[d] += 1
+    return quotas
+
+
+def get_difficulty(i, count, mix=DEFAULT_MIX):
+    """Difficulty of puzzle `i` of `count`, handing out tiers in `mix` order."""
+    limit = 0
+    for d, quota in difficulty_quotas(count, mix).items():
+        limit += quota
+        if i <= limit:
+            return d
+    return d
+
+
+def parse_mix(text):
+    """Parse `easy=0.2,medium=0.3,hard=0.5` into a difficulty mix."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip().lower()
+        if name not in CLUE_RANGES or name in mix:
+            raise argparse.ArgumentTypeError(f"bad difficulty {name!r} in mix")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight {weight!r} for {name}")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"negative weight for {name}")
+    if not sum(mix.values()) > 0:
+        raise argparse.ArgumentTypeError("mix weights add up to zero")
+    return mix
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("count", type=int)
+    parser.add_argument(
+        "difficulty", type=str.lower, choices=["easy", "medium", "hard", "mixed"]
+    )
+    parser.add_argument("--backend", choices=list(SEARCHES), default="mrv")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--grids", choices=["backtrack", "symmetry"], default="backtrack"
+    )
+    parser.add_argument("--bank")
+    parser.add_argument("--grade", action="store_true")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--only", type=int, action="append")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+    parser.add_argument("--output")
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--metrics")
+    parser.add_argument("--quotes", action="append")
+    parser.add_argument("--quote-mode", choices=QUOTE_MODES, default="cycle")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument("--node-budget", type=int)
+    parser.add_argument("--time-budget", type=float)
+    try:
+        return parser.parse_args(argv)
+    except SystemExit:
         print(HELP_PROMPT)
         sys.exit(1)
-    try:
-        count = int(sys.argv[1])
-        difficulty = sys.argv[2].lower()
-        if difficulty not in ["easy", "medium", "hard", "mixed"]:
-            print(HELP_PROMPT)
+
+
+def open_output(path):
+    if path is None:
+        return contextlib.nullcontext(sys.stdout)
+    return open(path, "w")
+
+
+def open_metrics(path):
+    if path is None:
+        return contextlib.nullcontext()
+    return open(path, "w")
+
+
+def main():
+    if sys.argv[1:2] == ["verify"]:
+        # Imported here because verifyPuzzles imports this module
+        import verifyPuzzles
+
+        verifyPuzzles.main(sys.argv[2:])
+        return
+    args = parse_args(sys.argv[1:])
+    if args.resume and not args.output:
+        print("--resume needs --output to know which file to continue", file=sys.stderr)
+        sys.exit(1)
+
+    existing = {}
+    if args.resume and os.path.exists(args.output):
+        try:
+            existing = read_puzzles(args.output)
+        except ValueError as e:
+            print(e, file=sys.stderr)
             sys.exit(1)
-    except Exception:
-        print(HELP_PROMPT)
+    indices = args.only or range(1, args.count + 1)
+    missing = [i for i in indices if puzzle_key(i) not in existing]
+    if existing:
+        print(
+            f"Resuming {args.output}: {len(existing)} puzzles done, "
+            f"{len(missing)} to generate",
+            file=sys.stderr,
+        )
+    try:
+        quotes = QuoteProvider(args.quotes, args.quote_mode)
+        plan = plan_sudoku_set(
+            args.count,
+            args.difficulty,
+            indices=missing,
+            bank=args.bank,
+            quotes=quotes,
+            output=args.output,
+            mix=args.mix,
+        )
+        if args.metrics:
+            check_output_path(args.metrics)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
         sys.exit(1)
+    planned = [puzzle.difficulty for puzzle in plan.puzzles]
+    split = ", ".join(f"{planned.count(d)} {d}" for d in CLUE_RANGES if d in planned)
+    if args.bank:
+        estimate = "from the bank"
+    else:
+        seconds = estimate_runtime(plan, args.backend, args.workers)
+        # --grade carves several candidates per puzzle
+        estimate = f"estimated {'at least ' if args.grade else ''}{seconds:.1f}s"
+    print(f"Planned {len(planned)} puzzles ({split}), {estimate}", file=sys.stderr)
+
+    with open_metrics(args.metrics) as metrics:
+        puzzles = iter_sudoku_set(
+            args.count,
+            args.difficulty,
+            backend=args.backend,
+            workers=args.workers,
+            seed=args.seed,
+            indices=missing,
+            grids=args.grids,
+            bank=args.bank,
+            grade=args.grade,
+            metrics=metrics,
+            quotes=quotes,
+            plan=plan,
+            node_budget=args.node_budget,
+            time_budget=args.time_budget,
+        )
+        write_puzzles(args, existing, puzzles)
 
-    puzzles = generate_sudoku_set(count, difficulty)
-    print(json.dumps(puzzles, indent=2))
+
+def write_puzzles(args, existing, puzzles):
+    if args.format == "ndjson":
+        with open_output(args.output) as out:
+            # One `{key: puzzle}` object per line, written as soon as it is
+            # ready. Puzzles kept from a previous run are rewritten first,
+            # which also drops a half-written last line.
+            for key, puzzle in existing.items():
+                out.write(json.dumps({key: puzzle}) + "\n")
+            for key, puzzle in puzzles:
+                out.write(json.dumps({key: puzzle}) + "\n")
+                out.flush()
+    else:
+        # Generate everything before opening the file, so a killed run does not
+        # wipe out the puzzles kept from an earlier one
+        result = {**existing, **dict(puzzles)}
+        result = dict(sorted(result.items(), key=lambda kv: puzzle_index(kv[0])))
+        with open_output(args.output) as out:
+            out.write(json.dumps(result, indent=2) + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+"""
+Grades Sudoku puzzles by the hardest human solving technique they need.
+
+The grader repeatedly applies the easiest technique that makes progress
+(placing a digit or removing a candidate) until the puzzle is solved or no
+technique applies. Candidates are kept as one bitmask per cell (bits 1..9),
+so every technique is a handful of integer operations per unit.
+"""
+
+from collections import namedtuple
+
+from sudokuTables import (
+    ALL_DIGITS,
+    BOX_OF,
+    BOXES,
+    COL_OF,
+    COLS,
+    PEERS,
+    POPCOUNT,
+    ROW_OF,
+    ROWS,
+    UNITS,
+)
+
+# Name, level and the difficulty bucket a puzzle needing it belongs to, from
+# easiest to hardest. "guess" means the logical techniques below got stuck.
+# Techniques sharing a level are equally hard for grading purposes.
+Technique = namedtuple("Technique", ["name", "level", "difficulty"])
+TECHNIQUES = [
+    Technique("naked_single", 1, "easy"),
+    Technique("hidden_single", 1, "easy"),
+    Technique("naked_pair", 2, "medium"),
+    Technique("hidden_pair", 2, "medium"),
+    Technique("pointing", 2, "medium"),
+    Technique("box_line", 2, "medium"),
+    Technique("x_wing", 3, "hard"),
+]
+GUESS = Technique("guess", 4, "hard")
+
+GradeResult = namedtuple("GradeResult", ["technique", "solved", "steps"])
+
+
+class LogicalSolver:
+    def __init__(self, board):
+        self.values = [0] * 81
+        self.cands = [ALL_DIGITS] * 81
+        for cell in range(81):
+            num = board[ROW_OF[cell]][COL_OF[cell]]
+            if num:
+                self.place(cell, num)
+
+    def place(self, cell, num):
+        mask = ~(1 << num)
+        self.values[cell] = num
+        self.cands[cell] = 0
+        cands = self.cands
+        for peer in PEERS[cell]:
+            cands[peer] &= mask
+
+    def eliminate(self, cells, mask):
+        """Remove the digits in `mask` from `cells`; True if anything changed."""
+        cands = self.cands
+        changed = False
+        for cell in cells:
+            if cands[cell] & mask:
+                cands[cell] &= ~mask
+                changed = True
+        return changed
+
+    def solved(self):
+        return all(self.values)
+
+    def naked_single(self):
+        values, cands = self.values, self.cands
+        progress = False
+        for cell in range(81):
+            if not values[cell] and POPCOUNT[cands[cell]] == 1:
+                self.place(cell, cands[cell].bit_length() - 1)
+                progress = True
+        return progress
+
+    def hidden_single(self):
+        cands = self.cands
+        progress = False
+        for unit in UNITS:
+            once = twice = 0
+            for cell in unit:
+                twice |= once & cands[cell]
+                once |= cands[cell]
+            singles = once & ~twice
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for cell in unit:
+                    if cands[cell] & bit:
+                        self.place(cell, bit.bit_length() - 1)
+                        progress = True
+                        break
+        return progress
+
+    def naked_pair(self):
+        cands = self.cands
+        progress = False
+        for unit in UNITS:
+            seen = {}
+            for cell in unit:
+                mask = cands[cell]
+                if POPCOUNT[mask] != 2:
+                    continue
+                if mask in seen:
+                    others = [c for c in unit if c != cell and c != seen[mask]]
+                    progress |= self.eliminate(others, mask)
+                else:
+                    seen[mask] = cell
+        return progress
+
+    def hidden_pair(self):
+        cands = self.cands
+        progress = False
+        for unit in UNITS:
+            # Cells (as a bitmask of unit positions) where each digit can go
+            where = [0] * 10
+            for pos, cell in enumerate(unit):
+                mask = cands[cell]
+                for num in range(1, 10):
+                    if mask & (1 << num):
+                        where[num] |= 1 << pos
+            seen = {}
+            for num in range(1, 10):
+                if bin(where[num]).count("1") != 2:
+                    continue
+                other = seen.get(where[num])
+                if other is None:
+                    seen[where[num]] = num
+                    continue
+                pair = (1 << num) | (1 << other)
+                for pos, cell in enumerate(unit):
+                    if where[num] >> pos & 1 and cands[cell] != pair:
+                        cands[cell] = pair
+                        progress = True
+        return progress
+
+    def pointing(self):
+        """A digit confined to one row/column of a box leaves the rest of that line."""
+        cands = self.cands
+        progress = False
+        for box in BOXES:
+            for num in range(1, 10):
+                bit = 1 << num
+                cells = [cell for cell in box if cands[cell] & bit]
+                if len(cells) < 2:
+                    continue
+                rows = {ROW_OF[cell] for cell in cells}
+                cols = {COL_OF[cell] for cell in cells}
+                if len(rows) == 1:
+                    line = [c for c in ROWS[rows.pop()] if c not in box]
+                    progress |= self.eliminate(line, bit)
+                if len(cols) == 1:
+                    line = [c for c in COLS[cols.pop()] if c not in box]
+                    progress |= self.eliminate(line, bit)
+        return progress
+
+    def box_line(self):
+        """A digit confined to one box within a row/column leaves the rest of that box."""
+        cands = self.cands
+        progress = False
+        for line in UNITS[:18]:
+            for num in range(1, 10):
+                bit = 1 << num
+                cells = [cell for cell in line if cands[cell] & bit]
+                if len(cells) < 2:
+                    continue
+                boxes = {BOX_OF[cell] for cell in cells}
+                if len(boxes) == 1:
+                    rest = [c for c in BOXES[boxes.pop()] if c not in line]
+                    progress |= self.eliminate(rest, bit)
+        return progress
+
+    def x_wing(self):
+        cands = self.cands
+        progress = False
+        for lines, cross in ((ROWS, COLS), (COLS, ROWS)):
+            for num in range(1, 10):
+                bit = 1 << num
+                seen = {}
+                for index, line in enumerate(lines):
+                    spots = tuple(
+                        pos for pos, cell in enumerate(line) if cands[cell] & bit
+                    )
+                    if len(spots) != 2:
+                        continue
+                    if spots not in seen:
+                        seen[spots] = index
+                        continue
+                    wing = (seen[spots], index)
+                    for pos in spots:
+                        others = [
+                            cell for k, cell in enumerate(cross[pos]) if k not in wing
+                        ]
+                        progress |= self.eliminate(others, bit)
+        return progress
+
+
+def grade_puzzle(board):
+    """Return the hardest technique needed to solve `board` as a GradeResult."""
+    solver = LogicalSolver(board)
+    hardest = 0
+    steps = 0
+    while not solver.solved():
+        for rank, technique in enumerate(TECHNIQUES):
+            if getattr(solver, technique.name)():
+                break
+        else:
+            return GradeResult(GUESS, False, steps)
+        steps += 1
+        hardest = max(hardest, rank)
+    return GradeResult(TECHNIQUES[hardest], True, steps)
+
+
+def grade_difficulty(board):
+    """The "easy" / "medium" / "hard" bucket for `board`."""
+    return grade_puzzle(board).technique.difficulty
@@ -1,4 +1,5 @@
-import json
+import os
+import sys
 import qrcode
 import randfacts
 from io import BytesIO
@@ -8,6 +9,9 @@ from reportlab.lib.utils import ImageReader
 from reportlab.lib import colors
 from PyPDF2 import PdfReader, PdfWriter
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generateSudoku import read_puzzles
+
 
 class RelativeSudokuPDFGenerator:
     def __init__(self, page_width_pt, page_height_pt, template_factors=None):
@@ -398,8 +402,7 @@ class RelativeSudokuPDFGenerator:
         # c.showPage()
 
     def generate_pdf(self, json_file, output_pdf):
-        with open(json_file) as f:
-            data = json.load(f)
+        data = read_puzzles(json_file)
         c = canvas.Canvas(output_pdf, pagesize=(self.page_width, self.page_height))
         dims = self.compute_dimensions()
         page = 1
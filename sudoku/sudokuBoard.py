@@ -0,0 +1,37 @@
+"""
+Compact Sudoku board: the 81 cells in row-major order in a single bytearray.
+
+Cell `9 * row + col` holds its digit, 0 for empty. Copying a board is one
+bytearray copy instead of a deepcopy of nine lists, and the solver indexes
+cells with plain ints through the tables in sudokuTables.
+"""
+
+
+class Board(bytearray):
+    @classmethod
+    def empty(cls):
+        return cls(81)
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Build a board from the nested 9x9 list format used in the JSON output."""
+        return cls(num for row in grid for num in row)
+
+    def to_grid(self):
+        return [list(self[9 * row : 9 * row + 9]) for row in range(9)]
+
+    def copy(self):
+        return Board(self)
+
+    def empty_cells(self):
+        return [cell for cell in range(81) if not self[cell]]
+
+    def clue_count(self):
+        return 81 - self.count(0)
+
+
+def as_board(board):
+    """A fresh Board copy of `board`, given either as a Board or a nested list."""
+    if isinstance(board, Board):
+        return board.copy()
+    return Board.from_grid(board)
@@ -0,0 +1,57 @@
+"""
+Motivational quotes attached to each generated puzzle.
+
+Puzzle `sdku-v1-q{i}` gets quote `i` of the quote list, where the list is the
+given quote files joined end to end. A book longer than the list either fails
+before any puzzle is generated ("strict") or wraps around to the start of the
+list ("cycle").
+"""
+
+import os
+import json
+
+QUOTES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "quotes"
+)
+DEFAULT_QUOTE_FILES = [os.path.join(QUOTES_DIR, "sudoku-motivational-quotes-v1.json")]
+QUOTE_MODES = ["cycle", "strict"]
+
+_quote_files = {}
+
+
+def load_quote_file(path):
+    """Read a list of `{"q", "a"}` quotes, cached so each process parses it once."""
+    if path not in _quote_files:
+        with open(path) as f:
+            quotes = json.load(f)
+        if not isinstance(quotes, list) or not quotes:
+            raise ValueError(f"{path} is not a non-empty list of quotes")
+        for n, quote in enumerate(quotes):
+            if not isinstance(quote, dict) or not {"q", "a"} <= quote.keys():
+                raise ValueError(f"{path}: quote {n} needs 'q' and 'a'")
+        _quote_files[path] = quotes
+    return _quote_files[path]
+
+
+class QuoteProvider:
+    def __init__(self, paths=None, mode="cycle"):
+        if mode not in QUOTE_MODES:
+            raise ValueError(f"unknown quote mode {mode!r}")
+        self.paths = list(paths or DEFAULT_QUOTE_FILES)
+        self.mode = mode
+        self.quotes = [quote for path in self.paths for quote in load_quote_file(path)]
+
+    def check_coverage(self, indices):
+        """Raise ValueError if some puzzle index has no quote of its own."""
+        if self.mode == "cycle" or not indices:
+            return
+        highest = max(indices)
+        if highest >= len(self.quotes):
+            raise ValueError(
+                f"{len(self.quotes)} quotes in {', '.join(self.paths)} only cover "
+                f"puzzles up to {len(self.quotes) - 1}, not {highest}; add quote "
+                f"files or use cycle mode"
+            )
+
+    def quote(self, i):
+        return self.quotes[i % len(self.quotes)]
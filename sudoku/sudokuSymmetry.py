@@ -0,0 +1,61 @@
+"""
+Validity-preserving Sudoku transformations.
+
+Relabelling digits, permuting bands/stacks, permuting rows within a band or
+columns within a stack, and transposing all map a valid grid to another valid
+grid (and a puzzle with a unique solution to another one with the same
+clue count and difficulty). Together they give 9! * 6^8 * 2 (about 1.2 trillion)
+variants of every grid.
+"""
+
+import random
+from collections import namedtuple
+
+# `digits[n]` is the new digit for n (digits[0] stays 0 so empty cells stay
+# empty). The new row r is taken from old row rows[r], likewise for columns.
+SymmetryTransform = namedtuple(
+    "SymmetryTransform", ["digits", "rows", "cols", "transpose"]
+)
+
+IDENTITY = SymmetryTransform(list(range(10)), list(range(9)), list(range(9)), False)
+
+
+def random_line_permutation(rng=random):
+    """Shuffle the three bands, then the three rows inside each band."""
+    bands = [0, 1, 2]
+    rng.shuffle(bands)
+    lines = []
+    for band in bands:
+        offsets = [0, 1, 2]
+        rng.shuffle(offsets)
+        lines.extend(3 * band + offset for offset in offsets)
+    return lines
+
+
+def random_transform(rng=random):
+    digits = list(range(1, 10))
+    rng.shuffle(digits)
+    return SymmetryTransform(
+        [0] + digits,
+        random_line_permutation(rng),
+        random_line_permutation(rng),
+        rng.random() < 0.5,
+    )
+
+
+def apply_transform(grid, transform):
+    digits, rows, cols, transpose = transform
+    if transpose:
+        grid = [list(col) for col in zip(*grid)]
+    return [[digits[grid[r][c]] for c in cols] for r in rows]
+
+
+class SymmetryGridFactory:
+    """Produces new complete grids by transforming a small pool of seed grids."""
+
+    def __init__(self, seed_grids):
+        self.seed_grids = [[row[:] for row in grid] for grid in seed_grids]
+
+    def grid(self, rng=random):
+        seed_grid = rng.choice(self.seed_grids)
+        return apply_transform(seed_grid, random_transform(rng))
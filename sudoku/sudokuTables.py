@@ -0,0 +1,26 @@
+"""
+Precomputed lookup tables shared by the generator, solvers and grader.
+
+Cells are numbered 0..80 in row-major order (cell = 9 * row + col) and digits
+are stored in candidate masks as bit `1 << digit`.
+"""
+
+ALL_DIGITS = 0x3FE  # bits 1..9, one per digit
+POPCOUNT = [bin(mask).count("1") for mask in range(ALL_DIGITS + 1)]
+
+ROW_OF = [cell // 9 for cell in range(81)]
+COL_OF = [cell % 9 for cell in range(81)]
+BOX_OF = [3 * (cell // 27) + (cell % 9) // 3 for cell in range(81)]
+
+ROWS = [[cell for cell in range(81) if ROW_OF[cell] == row] for row in range(9)]
+COLS = [[cell for cell in range(81) if COL_OF[cell] == col] for col in range(9)]
+BOXES = [[cell for cell in range(81) if BOX_OF[cell] == box] for box in range(9)]
+# All 27 units: rows 0..8, columns 9..17, boxes 18..26
+UNITS = ROWS + COLS + BOXES
+# The three units each cell belongs to
+CELL_UNITS = [(ROW_OF[cell], 9 + COL_OF[cell], 18 + BOX_OF[cell]) for cell in range(81)]
+# The 20 cells sharing a row, column or box with each cell
+PEERS = [
+    sorted({other for unit in CELL_UNITS[cell] for other in UNITS[unit]} - {cell})
+    for cell in range(81)
+]
@@ -0,0 +1,75 @@
+import unittest
+import contextlib
+import io
+
+from benchmarkSudoku import PHASES, load_corpus, percentile, run_benchmark, run_corpus
+from generateSudoku import BoardState, count_solutions
+from sudokuBoard import Board
+
+
+class TestBenchmarkSudoku(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_report_shape(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            report = run_benchmark(3, 1, ["mrv", "bitboard"], ["easy"], "symmetry")
+        self.assertEqual(report["config"]["count"], 3)
+        for backend in ("mrv", "bitboard"):
+            result = report["results"][backend]["easy"]
+            self.assertEqual(set(result), set(PHASES) | {"puzzle"})
+            for summary in result.values():
+                self.assertEqual(summary["n"], 3)
+                self.assertLessEqual(summary["p50_s"], summary["p99_s"])
+
+    def test_counts_must_be_positive(self):
+        import argparse
+
+        from benchmarkSudoku import positive_int
+
+        self.assertEqual(positive_int("3"), 3)
+        for text in ["0", "-2", "x"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                positive_int(text)
+
+    def test_corpus_entries(self):
+        corpus = load_corpus()
+        self.assertEqual(len({entry["name"] for entry in corpus}), len(corpus))
+        for entry in corpus:
+            self.assertEqual(len(entry["puzzle"]), 81)
+            self.assertTrue(entry["puzzle"].isdigit())
+            clues = sum(ch != "0" for ch in entry["puzzle"])
+            self.assertEqual(entry["clues"], clues)
+            # Unsolvable entries must be hard to refute, not rejected by a clash
+            board = Board(int(ch) for ch in entry["puzzle"])
+            self.assertTrue(BoardState(board).consistent, entry["name"])
+
+    def test_corpus_runner(self):
+        # The pathological entries take seconds on some backends, keep this quick
+        corpus = [e for e in load_corpus() if e["category"] in ("easy", "hard")]
+        with contextlib.redirect_stderr(io.StringIO()):
+            report = run_corpus(corpus, ["dlx", "bitboard"])
+        for backend in ("dlx", "bitboard"):
+            self.assertTrue(report["results"][backend]["all_ok"])
+            self.assertEqual(len(report["results"][backend]["puzzles"]), len(corpus))
+        entry = next(e for e in load_corpus() if e["name"] == "anti-backtrack")
+        board = [[int(entry["puzzle"][9 * r + c]) for c in range(9)] for r in range(9)]
+        self.assertEqual(count_solutions(board, limit=2, backend="dlx"), 1)
+
+    def test_pathological_corpus_is_fast(self):
+        # norvig-hard1 used to take over 20s on the bitboard backend
+        corpus = [e for e in load_corpus() if e["category"] == "pathological"]
+        with contextlib.redirect_stderr(io.StringIO()):
+            report = run_corpus(corpus, ["dlx", "bitboard"])
+        for backend in ("dlx", "bitboard"):
+            self.assertTrue(report["results"][backend]["all_ok"])
+            self.assertLess(report["results"][backend]["worst_s"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
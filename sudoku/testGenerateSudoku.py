@@ -10,8 +10,19 @@ from generateSudoku import (
     board_to_question,
     generate_sudoku_puzzle,
     generate_sudoku_set,
+    plan_sudoku_set,
+    estimate_runtime,
+    difficulty_quotas,
+    get_difficulty,
+    parse_mix,
+    iter_sudoku_set,
+    job_cost,
     count_solutions,
+    has_unique_solution,
+    BoardState,
 )
+from sudokuBoard import Board
+from sudokuTables import BOX_OF, CELL_UNITS, PEERS, UNITS
 
 
 class TestSudokuGenerator(unittest.TestCase):
@@ -30,6 +41,19 @@ class TestSudokuGenerator(unittest.TestCase):
                         nums.add(board[box_row * 3 + i][box_col * 3 + j])
                 self.assertEqual(nums, set(range(1, 10)))
 
+    def test_fill_nested_list(self):
+        import random
+
+        from generateSudoku import fill_diagonal_boxes, fill_remaining
+
+        board = [[0] * 9 for _ in range(9)]
+        fill_diagonal_boxes(board, random.Random(5))
+        self.assertEqual(
+            set(board[0][:3] + board[1][:3] + board[2][:3]), set(range(1, 10))
+        )
+        self.assertTrue(fill_remaining(board, 0, 3))
+        self.assertEqual(board, generate_complete_sudoku(random.Random(5)))
+
     def test_is_valid(self):
         board = generate_complete_sudoku()
         # Placing any number already in row/col/box should be invalid
@@ -46,6 +70,53 @@ class TestSudokuGenerator(unittest.TestCase):
             num = unused.pop()
             self.assertTrue(is_valid([[0] * 9 for _ in range(9)], 0, 0, num))
 
+    def test_board_state_matches_is_valid(self):
+        board = generate_complete_sudoku()
+        for i in range(9):
+            board[i][(i * 4) % 9] = 0
+            board[(i * 7) % 9][i] = 0
+        cells = Board.from_grid(board)
+        state = BoardState(cells)
+        for cell in cells.empty_cells():
+            for num in range(1, 10):
+                self.assertEqual(
+                    state.is_free(cell, num), is_valid(board, cell // 9, cell % 9, num)
+                )
+        cell = cells.empty_cells()[0]
+        num = next(n for n in range(1, 10) if state.is_free(cell, n))
+        state.place(cell, num)
+        self.assertFalse(state.is_free(cell, num))
+        self.assertEqual(cells[cell], num)
+        state.unplace(cell, num)
+        self.assertTrue(state.is_free(cell, num))
+        self.assertEqual(cells[cell], 0)
+
+    def test_board_round_trip(self):
+        grid = generate_complete_sudoku()
+        grid[2][5] = 0
+        board = Board.from_grid(grid)
+        self.assertEqual(len(board), 81)
+        self.assertEqual(board[9 * 2 + 5], 0)
+        self.assertEqual(board.to_grid(), grid)
+        self.assertEqual(board.clue_count(), 80)
+        copied = board.copy()
+        self.assertIsInstance(copied, Board)
+        copied[0] = 0
+        self.assertNotEqual(board[0], 0)
+
+    def test_lookup_tables(self):
+        self.assertEqual(len(UNITS), 27)
+        for unit in UNITS:
+            self.assertEqual(len(set(unit)), 9)
+        for cell in range(81):
+            self.assertEqual(len(PEERS[cell]), 20)
+            self.assertNotIn(cell, PEERS[cell])
+            for unit in CELL_UNITS[cell]:
+                self.assertIn(cell, UNITS[unit])
+        self.assertEqual(PEERS[0][:10], [1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+        self.assertEqual(BOX_OF[40], 4)
+        self.assertEqual(BOX_OF[80], 8)
+
     def test_solve_sudoku(self):
         board = generate_complete_sudoku()
         puzzle = copy.deepcopy(board)
@@ -70,6 +141,79 @@ class TestSudokuGenerator(unittest.TestCase):
             # Ensure unique solution
             self.assertEqual(count_solutions(puzzle), 1)
 
+    def test_count_solutions_limit(self):
+        import random
+
+        empty = [[0] * 9 for _ in range(9)]
+        self.assertEqual(count_solutions(empty, limit=2), 2)
+        self.assertEqual(count_solutions(empty, limit=5), 5)
+        self.assertFalse(has_unique_solution(empty))
+        # Seeded so the grid has a deadly rectangle: rows in different bands
+        # whose first two cells hold the same two digits swapped
+        board = generate_complete_sudoku(random.Random(2))
+        self.assertTrue(has_unique_solution(board))
+        rows = next(
+            (
+                (row, other)
+                for row in range(9)
+                for other in range(row + 1, 9)
+                if row // 3 != other // 3
+                and board[other][0] == board[row][1]
+                and board[other][1] == board[row][0]
+            ),
+            None,
+        )
+        self.assertIsNotNone(rows)
+        # Emptying its four cells leaves exactly two solutions
+        puzzle = [row[:] for row in board]
+        for r in rows:
+            puzzle[r][0] = puzzle[r][1] = 0
+        self.assertEqual(count_solutions(puzzle), 2)
+        self.assertFalse(has_unique_solution(puzzle))
+
+    def test_search_backends_agree(self):
+        board = generate_complete_sudoku()
+        puzzle = remove_cells(copy.deepcopy(board), "hard")
+        for backend in ("backtrack", "mrv", "dlx", "bitboard"):
+            solved = copy.deepcopy(puzzle)
+            self.assertTrue(solve_sudoku(solved, backend=backend))
+            self.assertEqual(solved, board)
+            self.assertEqual(count_solutions(puzzle, backend=backend), 1)
+            sparse = copy.deepcopy(puzzle)
+            sparse[0] = [0] * 9
+            self.assertEqual(
+                count_solutions(sparse, limit=3, backend=backend),
+                count_solutions(sparse, limit=3, backend="backtrack"),
+            )
+        # Cell (0, 8) has no candidates left
+        unsolvable = [[0] * 9 for _ in range(9)]
+        unsolvable[0][:8] = range(1, 9)
+        unsolvable[1][8] = 9
+        for backend in ("backtrack", "mrv", "dlx", "bitboard"):
+            attempt = copy.deepcopy(unsolvable)
+            self.assertFalse(solve_sudoku(attempt, backend=backend))
+            self.assertEqual(attempt, unsolvable)
+            self.assertEqual(count_solutions(unsolvable, backend=backend), 0)
+        # Two 5s in row 0 on an otherwise empty board
+        clashing = [[0] * 9 for _ in range(9)]
+        clashing[0][0] = clashing[0][1] = 5
+        for backend in ("backtrack", "mrv", "dlx", "bitboard"):
+            self.assertFalse(BoardState(Board.from_grid(clashing)).consistent)
+            self.assertEqual(count_solutions(clashing, limit=2, backend=backend), 0)
+            self.assertFalse(solve_sudoku(copy.deepcopy(clashing), backend=backend))
+
+    def test_remove_cells_backends_agree(self):
+        import random
+
+        board = generate_complete_sudoku(random.Random(9))
+        # Same rng draws, so both carves consider the same cells in order
+        incremental = remove_cells(
+            copy.deepcopy(board), "hard", "mrv", random.Random(1)
+        )
+        full = remove_cells(copy.deepcopy(board), "hard", "dlx", random.Random(1))
+        self.assertEqual(incremental, full)
+        self.assertTrue(has_unique_solution(incremental))
+
     def test_board_to_question_format(self):
         board = generate_complete_sudoku()
         puzzle = copy.deepcopy(board)
@@ -97,6 +241,231 @@ class TestSudokuGenerator(unittest.TestCase):
             self.assertIn("d", val)
             self.assertEqual(val["d"], "hard")
 
+    def test_generate_sudoku_set_parallel(self):
+        puzzles = generate_sudoku_set(10, "mixed", workers=3)
+        self.assertEqual(list(puzzles), [f"sdku-v1-q{i}" for i in range(1, 11)])
+        self.assertEqual(
+            [val["d"] for val in puzzles.values()],
+            ["easy"] * 2 + ["medium"] * 3 + ["hard"] * 5,
+        )
+        answers = {str(val["a"]) for val in puzzles.values()}
+        self.assertEqual(len(answers), 10)
+        for val in puzzles.values():
+            self.assertTrue(has_unique_solution(val["q"]))
+
+    def test_seeded_generation_is_reproducible(self):
+        puzzles = generate_sudoku_set(6, "mixed", seed=7)
+        self.assertEqual(puzzles, generate_sudoku_set(6, "mixed", seed=7, workers=2))
+        single = generate_sudoku_set(6, "mixed", seed=7, indices=[5])
+        self.assertEqual(single, {"sdku-v1-q5": puzzles["sdku-v1-q5"]})
+        self.assertNotEqual(puzzles, generate_sudoku_set(6, "mixed", seed=8))
+
+    def test_generation_metrics(self):
+        import io
+        import json
+
+        out = io.StringIO()
+        puzzles = generate_sudoku_set(4, "mixed", seed=7, metrics=out)
+        self.assertEqual(puzzles, generate_sudoku_set(4, "mixed", seed=7))
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line["key"] for line in lines], list(puzzles))
+        for line in lines:
+            self.assertEqual(line["attempts"], 1)
+            self.assertGreater(line["nodes"], 0)
+            self.assertGreater(line["fill_nodes"], 0)
+            self.assertGreaterEqual(
+                line["uniqueness_checks"], line["rejected_removals"]
+            )
+            clues = sum(1 for row in puzzles[line["key"]]["q"] for num in row if num)
+            removed = line["uniqueness_checks"] - line["rejected_removals"]
+            self.assertEqual(81 - clues, removed)
+
+    def test_plan_sudoku_set(self):
+        import os
+        import tempfile
+
+        plan = plan_sudoku_set(10, "mixed", indices=[1, 3, 10])
+        self.assertEqual(
+            [(p.index, p.difficulty) for p in plan.puzzles],
+            [(1, "easy"), (3, "medium"), (10, "hard")],
+        )
+        self.assertTrue(all({"q", "a"} <= p.quote.keys() for p in plan.puzzles))
+        self.assertGreater(estimate_runtime(plan), estimate_runtime(plan, workers=3))
+        with self.assertRaises(ValueError):
+            plan_sudoku_set(10, "mixed", indices=[11])
+        with self.assertRaises(ValueError):
+            plan_sudoku_set(10, "expert")
+        with tempfile.TemporaryDirectory() as directory:
+            plan_sudoku_set(10, "easy", output=os.path.join(directory, "out.json"))
+            with self.assertRaises(ValueError):
+                plan_sudoku_set(10, "easy", output=os.path.join(directory, "x", "o"))
+            with self.assertRaises(ValueError):
+                plan_sudoku_set(10, "easy", output=directory)
+
+    def test_difficulty_quotas(self):
+        for count in range(1, 60):
+            quotas = difficulty_quotas(count)
+            self.assertEqual(sum(quotas.values()), count)
+            for d, share in {"easy": 0.2, "medium": 0.3, "hard": 0.5}.items():
+                self.assertLess(abs(quotas[d] - share * count), 1)
+            levels = [get_difficulty(i, count) for i in range(1, count + 1)]
+            self.assertEqual({d: levels.count(d) for d in quotas}, quotas)
+        self.assertEqual(difficulty_quotas(3), {"easy": 1, "medium": 1, "hard": 1})
+
+    def test_custom_mix(self):
+        import argparse
+
+        mix = parse_mix("hard=3, easy=1")
+        self.assertEqual(list(mix), ["hard", "easy"])
+        self.assertEqual(difficulty_quotas(8, mix), {"hard": 6, "easy": 2})
+        self.assertEqual(get_difficulty(1, 8, mix), "hard")
+        self.assertEqual(get_difficulty(8, 8, mix), "easy")
+        for text in ["expert=1", "easy=x", "easy=-1", "easy=0", "easy=1,easy=2"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_mix(text)
+        puzzles = generate_sudoku_set(4, "mixed", seed=1, workers=2, mix=mix)
+        self.assertEqual(
+            [puzzles[f"sdku-v1-q{i}"]["d"] for i in range(1, 5)],
+            ["hard", "hard", "hard", "easy"],
+        )
+
+    def test_parallel_jobs_longest_first(self):
+        options = {"backend": "mrv"}
+        jobs = [(i, d, 1, options, False) for i, d in [(1, "easy"), (2, "hard")]]
+        self.assertGreater(job_cost(jobs[1]), job_cost(jobs[0]))
+        # Streamed in whatever order they finish, but keyed by the original index
+        streamed = dict(iter_sudoku_set(10, "mixed", seed=4, workers=3))
+        self.assertEqual(streamed, generate_sudoku_set(10, "mixed", seed=4))
+
+    def test_parallel_jobs_cancelled_on_error(self):
+        import time
+
+        from generateSudoku import run_puzzle_jobs
+
+        # The failing job costs the same as the rest, so it is queued first
+        jobs = [(0, "hard", 0, {"backend": "backtrack", "bank": "missing.json"}, False)]
+        jobs += [(i, "hard", i, {"backend": "backtrack"}, False) for i in range(1, 60)]
+        start = time.time()
+        with self.assertRaises(FileNotFoundError):
+            list(run_puzzle_jobs(jobs, workers=2))
+        # Running the queued hard backtrack jobs would take tens of seconds
+        self.assertLess(time.time() - start, 5)
+
+    def test_search_budget_retries_on_fresh_grid(self):
+        import io
+        import json
+        import random
+
+        from generateSudoku import SEARCHES, BudgetExceeded, SearchBudget, carve_board
+
+        board = Board.from_grid(generate_complete_sudoku(random.Random(2)))
+        for backend in SEARCHES:
+            with self.assertRaises(BudgetExceeded):
+                carve_board(
+                    board.copy(),
+                    "hard",
+                    backend,
+                    random.Random(2),
+                    budget=SearchBudget(5),
+                )
+
+        out = io.StringIO()
+        puzzles = generate_sudoku_set(3, "hard", seed=2, metrics=out, node_budget=60)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertGreater(sum(line["aborts"] for line in lines), 0)
+        for line in lines:
+            self.assertEqual(line["aborted_s"] > 0, line["aborts"] > 0)
+        for puzzle in puzzles.values():
+            self.assertTrue(has_unique_solution(puzzle["q"]))
+        # Node budgets keep seeded runs reproducible
+        self.assertEqual(
+            puzzles, generate_sudoku_set(3, "hard", seed=2, node_budget=60)
+        )
+
+        # A budget nothing fits in still ends, with an unbudgeted last grid
+        question, answer = generate_sudoku_puzzle("hard", node_budget=1)
+        self.assertTrue(has_unique_solution(question))
+
+    def test_ndjson_output(self):
+        import json
+        import subprocess
+        import sys
+
+        result = subprocess.run(
+            [sys.executable, "generateSudoku.py", "3", "easy", "--seed", "1"]
+            + ["--format", "ndjson"],
+            capture_output=True,
+            text=True,
+        )
+        lines = result.stdout.splitlines()
+        self.assertEqual(len(lines), 3)
+        puzzles = {}
+        for line in lines:
+            puzzles.update(json.loads(line))
+        self.assertEqual(puzzles, generate_sudoku_set(3, "easy", seed=1))
+
+    def test_read_puzzles_orders_ndjson(self):
+        import os
+        import tempfile
+
+        from generateSudoku import read_puzzles
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.ndjson")
+            with open(path, "w") as f:
+                f.write('{"sdku-v1-q10": {"d": "hard"}}\n')
+                f.write('{"sdku-v1-q2": {"d": "easy"}}\n')
+                # Valid JSON that is not a puzzle line
+                f.write('[1, 2]\n{"other": 1}\n7\n')
+                f.write('{"sdku-v1-q3": {"q": [[0, ')
+            puzzles = read_puzzles(path)
+        self.assertEqual(list(puzzles), ["sdku-v1-q2", "sdku-v1-q10"])
+
+    def test_read_puzzles_rejects_other_files(self):
+        import os
+        import tempfile
+
+        from generateSudoku import read_puzzles
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.json")
+            for text in ("not json at all\n", "[1, 2, 3]", '{"quote": "q"}', "42"):
+                with open(path, "w") as f:
+                    f.write(text)
+                with self.assertRaises(ValueError):
+                    read_puzzles(path)
+            with open(path, "w"):
+                pass
+            self.assertEqual(read_puzzles(path), {})
+
+    def test_resume_fills_in_missing_puzzles(self):
+        import json
+        import os
+        import subprocess
+        import sys
+        import tempfile
+
+        expected = generate_sudoku_set(4, "mixed", seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "partial.ndjson")
+            with open(path, "w") as f:
+                for key in ("sdku-v1-q1", "sdku-v1-q3"):
+                    f.write(json.dumps({key: expected[key]}) + "\n")
+                # Half-written line from an interrupted run
+                f.write('{"sdku-v1-q4": {"q": [[0, ')
+            result = subprocess.run(
+                [sys.executable, "generateSudoku.py", "4", "mixed", "--seed", "3"]
+                + ["--format", "ndjson", "--output", path, "--resume"],
+                capture_output=True,
+                text=True,
+            )
+            self.assertIn("2 to generate", result.stderr)
+            puzzles = {}
+            with open(path) as f:
+                for line in f:
+                    puzzles.update(json.loads(line))
+        self.assertEqual(puzzles, expected)
+
     def test_invalid_arguments(self):
         # Simulate invalid argument handling
         import subprocess
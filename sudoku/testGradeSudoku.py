@@ -0,0 +1,79 @@
+import unittest
+import random
+
+from generateSudoku import generate_complete_sudoku, generate_sudoku_puzzle
+from gradeSudoku import (
+    ALL_DIGITS,
+    COLS,
+    ROWS,
+    TECHNIQUES,
+    LogicalSolver,
+    grade_difficulty,
+    grade_puzzle,
+)
+
+EMPTY = [[0] * 9 for _ in range(9)]
+
+
+class TestGradeSudoku(unittest.TestCase):
+    def test_one_missing_cell_is_a_naked_single(self):
+        board = generate_complete_sudoku()
+        board[4][4] = 0
+        result = grade_puzzle(board)
+        self.assertTrue(result.solved)
+        self.assertEqual(result.technique.name, "naked_single")
+        self.assertEqual(grade_difficulty(board), "easy")
+
+    def test_empty_board_needs_guessing(self):
+        result = grade_puzzle(EMPTY)
+        self.assertFalse(result.solved)
+        self.assertEqual(result.technique.name, "guess")
+        self.assertEqual(grade_difficulty(EMPTY), "hard")
+
+    def test_hidden_single(self):
+        solver = LogicalSolver(EMPTY)
+        bit = 1 << 5
+        for cell in ROWS[0][1:]:
+            solver.cands[cell] &= ~bit
+        self.assertTrue(solver.hidden_single())
+        self.assertEqual(solver.values[0], 5)
+        self.assertFalse(solver.cands[9] & bit)
+
+    def test_x_wing(self):
+        solver = LogicalSolver(EMPTY)
+        bit = 1 << 7
+        # Rows 1 and 4 can only hold a 7 in columns 2 and 6
+        for row in (1, 4):
+            for col in range(9):
+                if col not in (2, 6):
+                    solver.cands[ROWS[row][col]] &= ~bit
+        self.assertTrue(solver.x_wing())
+        for col in (2, 6):
+            for row, cell in enumerate(COLS[col]):
+                self.assertEqual(bool(solver.cands[cell] & bit), row in (1, 4))
+        self.assertEqual(solver.cands[0], ALL_DIGITS)
+
+    def test_techniques_never_remove_the_answer(self):
+        rng = random.Random(11)
+        for _ in range(30):
+            question, answer = generate_sudoku_puzzle("hard", rng=rng)
+            solver = LogicalSolver(question)
+            while not solver.solved():
+                if not any(getattr(solver, t.name)() for t in TECHNIQUES):
+                    break
+            for cell in range(81):
+                num = answer[cell // 9][cell % 9]
+                if solver.values[cell]:
+                    self.assertEqual(solver.values[cell], num)
+                else:
+                    self.assertTrue(solver.cands[cell] & (1 << num))
+
+    def test_graded_generation_hits_the_bucket(self):
+        rng = random.Random(12)
+        for difficulty in ("easy", "medium", "hard"):
+            question, answer = generate_sudoku_puzzle(difficulty, rng=rng, grade=True)
+            self.assertEqual(grade_difficulty(question), difficulty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import json
+import unittest
+import tempfile
+
+from generateSudoku import generate_sudoku_set
+from sudokuQuotes import DEFAULT_QUOTE_FILES, QuoteProvider, load_quote_file
+
+
+class TestSudokuQuotes(unittest.TestCase):
+    def write_quotes(self, directory, name, count):
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            json.dump([{"q": f"{name} {n}", "a": "Author"} for n in range(count)], f)
+        return path
+
+    def test_default_file_is_found_from_any_directory(self):
+        cwd = os.getcwd()
+        try:
+            os.chdir(tempfile.gettempdir())
+            self.assertGreater(len(QuoteProvider().quotes), 100)
+        finally:
+            os.chdir(cwd)
+        # Parsed once per process
+        path = DEFAULT_QUOTE_FILES[0]
+        self.assertIs(load_quote_file(path), load_quote_file(path))
+
+    def test_files_are_joined_and_cycled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = self.write_quotes(directory, "first", 2)
+            second = self.write_quotes(directory, "second", 3)
+            quotes = QuoteProvider([first, second])
+            self.assertEqual(
+                [quotes.quote(i)["q"] for i in range(1, 7)],
+                ["first 1", "second 0", "second 1", "second 2", "first 0", "first 1"],
+            )
+
+    def test_strict_mode_checks_coverage(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_quotes(directory, "short", 4)
+            strict = QuoteProvider([path], mode="strict")
+            strict.check_coverage(range(1, 4))
+            with self.assertRaises(ValueError):
+                strict.check_coverage(range(1, 5))
+            # Fails before generating anything
+            with self.assertRaises(ValueError):
+                generate_sudoku_set(5, "easy", seed=1, quotes=strict)
+
+    def test_bad_quote_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bad.json")
+            with open(path, "w") as f:
+                json.dump([{"q": "no author"}], f)
+            with self.assertRaises(ValueError):
+                QuoteProvider([path])
+
+
+if __name__ == "__main__":
+    unittest.main()
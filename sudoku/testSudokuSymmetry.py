@@ -0,0 +1,103 @@
+import unittest
+import copy
+import random
+
+from generateSudoku import (
+    generate_complete_sudoku,
+    generate_sudoku_set,
+    remove_cells,
+    count_solutions,
+)
+from sudokuSymmetry import (
+    IDENTITY,
+    SymmetryGridFactory,
+    apply_transform,
+    random_line_permutation,
+    random_transform,
+)
+
+
+def assert_valid_grid(test, board):
+    for i in range(9):
+        test.assertEqual(set(board[i]), set(range(1, 10)))
+        test.assertEqual(set(row[i] for row in board), set(range(1, 10)))
+    for box in range(9):
+        r0, c0 = 3 * (box // 3), 3 * (box % 3)
+        nums = {board[r0 + i][c0 + j] for i in range(3) for j in range(3)}
+        test.assertEqual(nums, set(range(1, 10)))
+
+
+class TestSudokuSymmetry(unittest.TestCase):
+    def test_line_permutation_keeps_bands(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            lines = random_line_permutation(rng)
+            self.assertEqual(sorted(lines), list(range(9)))
+            for band in range(3):
+                chunk = lines[3 * band : 3 * band + 3]
+                self.assertEqual(len({line // 3 for line in chunk}), 1)
+
+    def test_identity(self):
+        board = generate_complete_sudoku()
+        self.assertEqual(apply_transform(board, IDENTITY), board)
+
+    def test_transform_keeps_grids_valid(self):
+        rng = random.Random(2)
+        board = generate_complete_sudoku(rng)
+        for _ in range(20):
+            assert_valid_grid(self, apply_transform(board, random_transform(rng)))
+
+    def test_transform_keeps_puzzles_unique(self):
+        rng = random.Random(3)
+        answer = generate_complete_sudoku(rng)
+        question = remove_cells(copy.deepcopy(answer), "hard", rng=rng)
+        clues = sum(cell != 0 for row in question for cell in row)
+        for _ in range(5):
+            transform = random_transform(rng)
+            new_question = apply_transform(question, transform)
+            new_answer = apply_transform(answer, transform)
+            self.assertEqual(
+                sum(cell != 0 for row in new_question for cell in row), clues
+            )
+            self.assertEqual(count_solutions(new_question), 1)
+            for r in range(9):
+                for c in range(9):
+                    if new_question[r][c]:
+                        self.assertEqual(new_question[r][c], new_answer[r][c])
+
+    def test_grid_factory(self):
+        rng = random.Random(4)
+        factory = SymmetryGridFactory([generate_complete_sudoku(rng)])
+        grids = [factory.grid(rng) for _ in range(10)]
+        for grid in grids:
+            assert_valid_grid(self, grid)
+        self.assertEqual(len({str(grid) for grid in grids}), 10)
+        assert_valid_grid(self, generate_complete_sudoku(rng, "symmetry"))
+
+    def test_puzzles_from_bank(self):
+        import json
+        import os
+        import tempfile
+
+        templates = generate_sudoku_set(1, "hard", seed=5)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bank.json")
+            with open(path, "w") as f:
+                json.dump(templates, f)
+            puzzles = generate_sudoku_set(6, "hard", seed=6, bank=path)
+            with self.assertRaises(ValueError):
+                generate_sudoku_set(6, "medium", seed=6, bank=path)
+        template = templates["sdku-v1-q1"]
+        self.assertEqual(template["d"], "hard")
+        clues = sum(cell != 0 for row in template["q"] for cell in row)
+        for puzzle in puzzles.values():
+            self.assertEqual(puzzle["d"], "hard")
+            self.assertEqual(
+                sum(cell != 0 for row in puzzle["q"] for cell in row), clues
+            )
+            self.assertEqual(count_solutions(puzzle["q"]), 1)
+            assert_valid_grid(self, puzzle["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import copy
+import importlib.util
+
+from generateSudoku import generate_sudoku_set
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    from validatePuzzles import validate_puzzles
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestValidatePuzzles(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.puzzles = generate_sudoku_set(10, "mixed", seed=21)
+
+    def test_generated_puzzles_pass(self):
+        self.assertEqual(validate_puzzles(self.puzzles), {})
+        self.assertEqual(validate_puzzles({}), {})
+
+    def test_detects_broken_puzzles(self):
+        puzzles = copy.deepcopy(self.puzzles)
+        # Swapping two cells of a row keeps the row valid but breaks columns
+        # and boxes
+        for grid in (puzzles["sdku-v1-q1"]["q"], puzzles["sdku-v1-q1"]["a"]):
+            grid[0][0], grid[0][3] = grid[0][3], grid[0][0]
+        # A clue that disagrees with the answer
+        question = puzzles["sdku-v1-q4"]["q"]
+        answer = puzzles["sdku-v1-q4"]["a"]
+        row, col = next(
+            (r, c) for r in range(9) for c in range(9) if question[r][c] != 0
+        )
+        question[row][col] = answer[row][col] % 9 + 1
+        # Labelled easy with a hard clue count
+        puzzles["sdku-v1-q10"]["d"] = "easy"
+
+        failures = validate_puzzles(puzzles)
+        self.assertEqual(set(failures), {"sdku-v1-q1", "sdku-v1-q4", "sdku-v1-q10"})
+        self.assertEqual(failures["sdku-v1-q1"], ["columns", "boxes"])
+        self.assertEqual(failures["sdku-v1-q4"], ["clues_match_answer"])
+        self.assertEqual(failures["sdku-v1-q10"], ["clue_count"])
+        del failures["sdku-v1-q10"]
+        self.assertEqual(validate_puzzles(puzzles, check_clue_counts=False), failures)
+
+    def test_command_line(self):
+        import json
+        import os
+        import subprocess
+        import sys
+        import tempfile
+
+        def run(*args):
+            return subprocess.run(
+                [sys.executable, "validatePuzzles.py", *args],
+                capture_output=True,
+                text=True,
+            )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            good = os.path.join(tmp, "book.json")
+            with open(good, "w") as f:
+                json.dump(self.puzzles, f)
+            garbage = os.path.join(tmp, "garbage.json")
+            with open(garbage, "w") as f:
+                f.write("not a puzzle file\n")
+
+            result = run(good, "--any-clue-count")
+            self.assertEqual(result.returncode, 0)
+            self.assertIn("10 puzzles, 0 failed", result.stdout)
+            # Unknown flags are an error, not silently ignored
+            self.assertEqual(run(good, "--any-clue-counts").returncode, 2)
+            for path in (garbage, os.path.join(tmp, "missing.json")):
+                result = run(good, path)
+                self.assertEqual(result.returncode, 1)
+                self.assertNotIn("Traceback", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import copy
+
+from generateSudoku import generate_sudoku_set
+from verifyPuzzles import verify_puzzles
+
+
+class TestVerifyPuzzles(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.puzzles = generate_sudoku_set(6, "hard", seed=31)
+
+    def test_generated_puzzles_pass(self):
+        self.assertEqual(verify_puzzles(self.puzzles), {})
+        self.assertEqual(verify_puzzles(self.puzzles, workers=2, backend="mrv"), {})
+
+    def test_detects_bad_puzzles(self):
+        puzzles = copy.deepcopy(self.puzzles)
+        # Dropping every clue leaves many solutions
+        puzzles["sdku-v1-q1"]["q"] = [[0] * 9 for _ in range(9)]
+        # Relabelling two digits of the answer no longer matches the clues
+        answer = puzzles["sdku-v1-q2"]["a"]
+        puzzles["sdku-v1-q2"]["a"] = [
+            [{1: 2, 2: 1}.get(num, num) for num in row] for row in answer
+        ]
+        # Two equal digits in the first row
+        puzzles["sdku-v1-q3"]["a"][0][0] = puzzles["sdku-v1-q3"]["a"][0][1]
+
+        failures = verify_puzzles(puzzles)
+        self.assertEqual(failures["sdku-v1-q1"], ["more than one solution"])
+        self.assertEqual(failures["sdku-v1-q2"], ["clues do not match the answer"])
+        self.assertEqual(failures["sdku-v1-q3"], ["answer is not a valid grid"])
+        self.assertEqual(len(failures), 3)
+
+    def test_verify_subcommand(self):
+        import json
+        import os
+        import subprocess
+        import sys
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.json")
+            with open(path, "w") as f:
+                json.dump(self.puzzles, f)
+            result = subprocess.run(
+                [sys.executable, "generateSudoku.py", "verify", path],
+                capture_output=True,
+                text=True,
+            )
+        self.assertEqual(result.returncode, 0)
+        self.assertIn("6 puzzles, 0 failed", result.stdout)
+
+        missing = subprocess.run(
+            [sys.executable, "generateSudoku.py", "verify", path],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(missing.returncode, 1)
+        self.assertNotIn("Traceback", missing.stderr)
+
+    def test_verify_subcommand_rejects_bad_files(self):
+        import json
+        import os
+        import subprocess
+        import sys
+        import tempfile
+
+        truncated = json.dumps(self.puzzles, indent=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.json")
+            for text in ("not a puzzle file\n", truncated[: len(truncated) // 2], ""):
+                with open(path, "w") as f:
+                    f.write(text)
+                result = subprocess.run(
+                    [sys.executable, "generateSudoku.py", "verify", path],
+                    capture_output=True,
+                    text=True,
+                )
+                self.assertEqual(result.returncode, 1)
+                self.assertNotIn("Traceback", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Vectorised QA checks for puzzle sets written by generateSudoku.py.
+
+All answers and questions are stacked into (N, 9, 9) arrays and every check
+runs over the whole set at once, so even very large books are checked in
+seconds. This checks structure only; uniqueness of the solutions is not
+checked here.
+
+Usage:
+  python validatePuzzles.py <file> [<file> ...] [--any-clue-count]
+"""
+
+import sys
+import argparse
+
+import numpy as np
+
+from generateSudoku import CLUE_RANGES, read_puzzles
+
+DIGITS = np.arange(1, 10, dtype=np.int8)
+
+
+def puzzles_to_arrays(puzzles):
+    """Return (keys, questions, answers, difficulties) for a `sdku-v1-q*` map."""
+    keys = list(puzzles)
+    questions = np.array([puzzles[key]["q"] for key in keys], dtype=np.int8)
+    answers = np.array([puzzles[key]["a"] for key in keys], dtype=np.int8)
+    difficulties = np.array([puzzles[key]["d"] for key in keys])
+    return keys, questions.reshape(-1, 9, 9), answers.reshape(-1, 9, 9), difficulties
+
+
+def boxes_as_rows(grids):
+    """Rearrange (N, 9, 9) grids so row k of the result is box k."""
+    return grids.reshape(-1, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(-1, 9, 9)
+
+
+def validate_arrays(questions, answers, difficulties=None, clue_ranges=CLUE_RANGES):
+    """Run every check over (N, 9, 9) arrays.
+
+    Returns a dict of check name -> boolean array of shape (N,), True where the
+    puzzle passes. Clue counts are only checked when `difficulties` is given.
+    """
+    # one_hot[n, r, c, d] is True when answer n has digit d + 1 at (r, c)
+    one_hot = answers[..., None] == DIGITS
+    checks = {
+        "rows": (one_hot.sum(axis=2) == 1).all(axis=(1, 2)),
+        "columns": (one_hot.sum(axis=1) == 1).all(axis=(1, 2)),
+        "boxes": ((boxes_as_rows(answers)[..., None] == DIGITS).sum(axis=2) == 1).all(
+            axis=(1, 2)
+        ),
+        "clues_match_answer": ((questions == 0) | (questions == answers)).all(
+            axis=(1, 2)
+        ),
+    }
+    if difficulties is not None:
+        clue_counts = (questions != 0).sum(axis=(1, 2))
+        in_range = np.zeros(len(questions), dtype=bool)
+        for difficulty, (low, high) in clue_ranges.items():
+            selected = difficulties == difficulty
+            in_range |= selected & (clue_counts >= low) & (clue_counts <= high)
+        checks["clue_count"] = in_range
+    return checks
+
+
+def validate_puzzles(puzzles, check_clue_counts=True):
+    """Return {key: [failed check names]} for every puzzle that fails a check."""
+    if not puzzles:
+        return {}
+    keys, questions, answers, difficulties = puzzles_to_arrays(puzzles)
+    checks = validate_arrays(
+        questions, answers, difficulties if check_clue_counts else None
+    )
+    failures = {}
+    for name, passed in checks.items():
+        for index in np.flatnonzero(~passed):
+            failures.setdefault(keys[index], []).append(name)
+    return failures
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="validatePuzzles.py")
+    parser.add_argument("files", nargs="+")
+    # Graded puzzles (--grade) are bucketed by technique, not clue count
+    parser.add_argument("--any-clue-count", action="store_true")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in args.files:
+        try:
+            puzzles = read_puzzles(path)
+            if not puzzles:
+                raise ValueError(f"{path}: no puzzles found")
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            failed = True
+            continue
+        failures = validate_puzzles(puzzles, not args.any_clue_count)
+        print(f"{path}: {len(puzzles)} puzzles, {len(failures)} failed")
+        for key, names in failures.items():
+            print(f"  {key}: {', '.join(names)}")
+        failed = failed or bool(failures)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
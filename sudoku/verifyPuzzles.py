@@ -0,0 +1,77 @@
+"""
+Audit a generated puzzle file before printing.
+
+Every puzzle must have exactly one solution and that solution must be the
+stored answer. Checking that the answer is a valid grid agreeing with the
+clues, plus one solution count capped at 2, covers both.
+
+Usage:
+  python generateSudoku.py verify <file> [--workers N] [--backend NAME]
+"""
+
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from generateSudoku import SEARCHES, count_solutions, read_puzzles
+from sudokuTables import UNITS
+
+VERIFY_CHUNKSIZE = 64
+
+
+def answer_problems(question, answer):
+    cells = [num for row in answer for num in row]
+    if any(set(cells[cell] for cell in unit) != set(range(1, 10)) for unit in UNITS):
+        return ["answer is not a valid grid"]
+    clues = [num for row in question for num in row]
+    if any(clue and clue != cells[cell] for cell, clue in enumerate(clues)):
+        return ["clues do not match the answer"]
+    return []
+
+
+def verify_puzzle(job):
+    """Return `(key, problems)` for one puzzle; no problems means it is fine."""
+    key, puzzle, backend = job
+    problems = answer_problems(puzzle["q"], puzzle["a"])
+    solutions = count_solutions(puzzle["q"], limit=2, backend=backend)
+    if solutions == 0:
+        problems.append("no solution")
+    elif solutions > 1:
+        problems.append("more than one solution")
+    return key, problems
+
+
+def verify_puzzles(puzzles, workers=1, backend="dlx"):
+    """Return {key: problems} for every puzzle in `puzzles` that fails."""
+    jobs = [(key, puzzle, backend) for key, puzzle in puzzles.items()]
+    if workers <= 1:
+        results = map(verify_puzzle, jobs)
+        return {key: problems for key, problems in results if problems}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(verify_puzzle, jobs, chunksize=VERIFY_CHUNKSIZE)
+        return {key: problems for key, problems in results if problems}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="generateSudoku.py verify")
+    parser.add_argument("file")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--backend", choices=list(SEARCHES), default="dlx")
+    args = parser.parse_args(argv)
+
+    try:
+        puzzles = read_puzzles(args.file)
+        if not puzzles:
+            raise ValueError(f"{args.file}: no puzzles found")
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    failures = verify_puzzles(puzzles, args.workers, args.backend)
+    for key, problems in failures.items():
+        print(f"{key}: {', '.join(problems)}")
+    print(f"{args.file}: {len(puzzles)} puzzles, {len(failures)} failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])